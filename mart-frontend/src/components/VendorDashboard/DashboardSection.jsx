@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useMemo } from 'react';
 import { useVendor } from '../../context/VendorContext';
+import { getSalesAnalytics } from '../../config/api';
 import { FaNairaSign } from "react-icons/fa6";
 import { Card, CardContent, CardHeader, CardTitle, Button } from './UIComponents';
 import { MapPin, Package, ShoppingCart, Mail, Phone, ExternalLink, Calendar, X } from 'lucide-react';
@@ -15,12 +16,40 @@ const STATUS_CHOICES = [
   { value: 'cancelled', label: 'Cancelled' },
 ];
 
+// With no start date the totals cover the store's whole history.
+const ALL_TIME_START = '2000-01-01';
+
+const toISODate = (date) => date.toISOString().split('T')[0];
+
 const DashboardSection = () => {
-  const { storeData, products, orders } = useVendor();
+  const { storeData, products, productCount, orders } = useVendor();
   const [filters, setFilters] = useState({
     dateRange: { start: null, end: null },
     selectedProduct: 'all',
   });
+  const [analytics, setAnalytics] = useState(null);
+
+  // Revenue and order totals are summed on the server: the orders in the
+  // context are only the pages loaded so far.
+  useEffect(() => {
+    let cancelled = false;
+    const from = filters.dateRange.start ? toISODate(filters.dateRange.start) : ALL_TIME_START;
+    const to = toISODate(filters.dateRange.end || new Date());
+    setAnalytics(null);
+    getSalesAnalytics(from, to)
+      .then(data => { if (!cancelled) setAnalytics(data); })
+      .catch(err => console.error('Error fetching sales analytics:', err));
+    return () => { cancelled = true; };
+  }, [filters.dateRange]);
+
+  const totals = useMemo(() => {
+    if (!analytics) return null;
+    if (filters.selectedProduct === 'all') {
+      return { revenue: parseFloat(analytics.totals.revenue), orderCount: analytics.totals.order_count };
+    }
+    const row = analytics.products.find(product => String(product.product_id) === String(filters.selectedProduct));
+    return row ? { revenue: parseFloat(row.revenue), orderCount: row.order_count } : { revenue: 0, orderCount: 0 };
+  }, [analytics, filters.selectedProduct]);
 
   const filteredOrders = useMemo(() => {
     return orders.filter(order => {
@@ -28,16 +57,11 @@ const DashboardSection = () => {
       const dateInRange = (!filters.dateRange.start || orderDate >= filters.dateRange.start) &&
                           (!filters.dateRange.end || orderDate <= filters.dateRange.end);
       const productMatch = filters.selectedProduct === 'all' ||
-                           order.items.some(item => item.product === filters.selectedProduct);
+                           order.items.some(item => String(item.product) === String(filters.selectedProduct));
       return dateInRange && productMatch;
     });
   }, [orders, filters]);
 
-  const totalRevenue = useMemo(() => 
-    filteredOrders.reduce((sum, order) => sum + parseFloat(order.total_amount), 0),
-    [filteredOrders]
-  );
-
   const handleFilterChange = (key, value) => {
     setFilters(prev => ({ ...prev, [key]: value }));
   };
@@ -139,19 +163,19 @@ const DashboardSection = () => {
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4 md:gap-6">
         <StatCard
           title="Total Revenue"
-          value={`₦${totalRevenue.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 })}`}
+          value={totals ? `₦${totals.revenue.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 })}` : '…'}
           icon={<FaNairaSign className="w-6 h-6 md:w-8 md:h-8" />}
           color={storeData.primary_color}
         />
         <StatCard
           title="Total Orders"
-          value={filteredOrders.length}
+          value={totals ? totals.orderCount : '…'}
           icon={<ShoppingCart className="w-6 h-6 md:w-8 md:h-8" />}
           color={storeData.primary_color}
         />
         <StatCard
           title="Total Products"
-          value={products.length}
+          value={productCount}
           icon={<Package className="w-6 h-6 md:w-8 md:h-8" />}
           color={storeData.primary_color}
         />
@@ -2,16 +2,18 @@ import React, { useState, useEffect } from 'react';
 import { useVendor } from '../../context/VendorContext';
 import { Card, CardContent, CardHeader, Button, Alert, Modal, Select, Spinner } from './UIComponents';
 import { FaEye, FaTrash, FaFileAlt, FaMoneyBillWave } from "react-icons/fa";
-import { getOrders, getOrderDetails, updateOrderStatus, deleteOrder } from '../../config/api';
+import { getOrders, getOrderDetails, updateOrderStatus, deleteOrder, getPaymentProof } from '../../config/api';
 
 export default function ManageOrdersSection() {
-  const { orders, setOrders } = useVendor();
+  const { orders, setOrders, ordersNext, setOrdersNext, loadMoreOrders } = useVendor();
   const [selectedOrder, setSelectedOrder] = useState(null);
   const [error, setError] = useState(null);
   const [isOrderModalOpen, setIsOrderModalOpen] = useState(false);
   const [isPaymentProofModalOpen, setIsPaymentProofModalOpen] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [newStatus, setNewStatus] = useState('');
+  const [paymentProofUrl, setPaymentProofUrl] = useState(null);
 
   useEffect(() => {
     fetchOrders();
@@ -20,8 +22,9 @@ export default function ManageOrdersSection() {
   const fetchOrders = async () => {
     setIsLoading(true);
     try {
-      const fetchedOrders = await getOrders();
-      setOrders(fetchedOrders);
+      const page = await getOrders();
+      setOrders(page.results);
+      setOrdersNext(page.next);
       setError(null);
     } catch (err) {
       console.error('Error fetching orders:', err);
@@ -31,6 +34,19 @@ export default function ManageOrdersSection() {
     }
   };
 
+  const handleLoadMore = async () => {
+    setIsLoadingMore(true);
+    try {
+      await loadMoreOrders();
+      setError(null);
+    } catch (err) {
+      console.error('Error fetching more orders:', err);
+      setError('Failed to fetch more orders. Please try again.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const fetchOrderDetails = async (orderId) => {
     setIsLoading(true);
     try {
@@ -90,12 +106,27 @@ export default function ManageOrdersSection() {
     setNewStatus('');
   };
 
-  const openPaymentProofModal = () => {
-    setIsPaymentProofModalOpen(true);
+  useEffect(() => {
+    return () => {
+      if (paymentProofUrl) URL.revokeObjectURL(paymentProofUrl);
+    };
+  }, [paymentProofUrl]);
+
+  const openPaymentProofModal = async () => {
+    try {
+      const proof = await getPaymentProof(selectedOrder.payment_proof);
+      setPaymentProofUrl(URL.createObjectURL(proof));
+      setIsPaymentProofModalOpen(true);
+      setError(null);
+    } catch (err) {
+      console.error('Error fetching payment proof:', err);
+      setError('Failed to load the payment proof. Please try again.');
+    }
   };
 
   const closePaymentProofModal = () => {
     setIsPaymentProofModalOpen(false);
+    setPaymentProofUrl(null);
   };
 
   return (
@@ -143,6 +174,13 @@ export default function ManageOrdersSection() {
                   )}
                 </tbody>
               </table>
+              {ordersNext && (
+                <div className="flex justify-center mt-4">
+                  <Button onClick={handleLoadMore} variant="secondary" size="sm" disabled={isLoadingMore}>
+                    {isLoadingMore ? 'Loading...' : 'Load more orders'}
+                  </Button>
+                </div>
+              )}
             </div>
           )}
         </CardContent>
@@ -204,13 +242,13 @@ export default function ManageOrdersSection() {
       </Modal>
 
       <Modal isOpen={isPaymentProofModalOpen} onClose={closePaymentProofModal} title="Payment Proof">
-        {selectedOrder && selectedOrder.payment_proof && (
+        {selectedOrder && paymentProofUrl && (
           <div className="flex justify-center items-center">
-            {selectedOrder.payment_proof.toLowerCase().endsWith('.pdf') ? (
+            {selectedOrder.payment_proof_content_type === 'application/pdf' ? (
               <div className="flex items-center">
                 <FaFileAlt className="text-red-500 mr-2" size={24} />
                 <a
-                  href={selectedOrder.payment_proof}
+                  href={paymentProofUrl}
                   target="_blank"
                   rel="noopener noreferrer"
                   className="text-blue-600 hover:underline"
@@ -220,7 +258,7 @@ export default function ManageOrdersSection() {
               </div>
             ) : (
               <img
-                src={selectedOrder.payment_proof}
+                src={paymentProofUrl}
                 alt="Payment Proof"
                 className="max-w-full h-auto rounded-lg"
               />
@@ -7,7 +7,7 @@ import { FaPen, FaTrash } from "react-icons/fa";
 import * as api from '../../config/api';
 
 export default function ManageProductsSection() {
-  const { products, setProducts } = useVendor();
+  const { products, setProducts, productsNext, loadMoreProducts } = useVendor();
   const [formData, setFormData] = useState({
     name: '',
     description: '',
@@ -18,6 +18,7 @@ export default function ManageProductsSection() {
   const [editingProductId, setEditingProductId] = useState(null);
   const [error, setError] = useState(null);
   const [imagePreview, setImagePreview] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   const handleInputChange = (e) => {
     const { name, value, type, files } = e.target;
@@ -66,6 +67,19 @@ export default function ManageProductsSection() {
     }
   };
 
+  const handleLoadMore = async () => {
+    setIsLoadingMore(true);
+    try {
+      await loadMoreProducts();
+      setError(null);
+    } catch (error) {
+      console.error('Error fetching more products:', error);
+      setError('Failed to fetch more products. Please try again.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const startEditing = (product) => {
     setEditingProductId(product.id);
     setFormData({
@@ -173,6 +187,13 @@ export default function ManageProductsSection() {
             )}
           </ul>
         </div>
+        {productsNext && (
+          <div className="flex justify-center mt-4">
+            <Button onClick={handleLoadMore} disabled={isLoadingMore}>
+              {isLoadingMore ? 'Loading...' : 'Load more products'}
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );
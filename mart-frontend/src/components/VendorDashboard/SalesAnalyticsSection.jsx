@@ -1,5 +1,6 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { useVendor } from '../../context/VendorContext';
+import { getSalesAnalytics } from '../../config/api';
 import { Card, CardContent, CardHeader, CardTitle, Select } from './UIComponents';
 import { FaNairaSign } from "react-icons/fa6";
 import { Package, ShoppingCart, TrendingUp } from 'lucide-react';
@@ -21,70 +22,60 @@ import {
 
 const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8'];
 
+const TIME_FRAMES = {
+  last7days: (date) => date.setDate(date.getDate() - 6),
+  last30days: (date) => date.setDate(date.getDate() - 29),
+  last3months: (date) => date.setMonth(date.getMonth() - 3),
+  last6months: (date) => date.setMonth(date.getMonth() - 6),
+  lastYear: (date) => date.setFullYear(date.getFullYear() - 1),
+};
+
+const toISODate = (date) => date.toISOString().split('T')[0];
+
 const SalesAnalyticsSection = () => {
-  const { storeData, products, orders } = useVendor();
+  const { storeData, productCount } = useVendor();
   const [timeFrame, setTimeFrame] = useState('last30days');
-
-  const filteredOrders = useMemo(() => {
-    const now = new Date();
-    const timeFrames = {
-      last7days: new Date(now.setDate(now.getDate() - 7)),
-      last30days: new Date(now.setDate(now.getDate() - 30)),
-      last3months: new Date(now.setMonth(now.getMonth() - 3)),
-      last6months: new Date(now.setMonth(now.getMonth() - 6)),
-      lastYear: new Date(now.setFullYear(now.getFullYear() - 1))
-    };
-
-    return orders.filter(order => new Date(order.created_at) >= timeFrames[timeFrame]);
-  }, [orders, timeFrame]);
-
-  const salesData = useMemo(() => {
-    const data = {};
-    filteredOrders.forEach(order => {
-      const date = new Date(order.created_at).toLocaleDateString();
-      if (!data[date]) {
-        data[date] = { date, sales: 0, orders: 0 };
-      }
-      data[date].sales += parseFloat(order.total_amount);
-      data[date].orders += 1;
-    });
-    return Object.values(data).sort((a, b) => new Date(a.date) - new Date(b.date));
-  }, [filteredOrders]);
-
-  const productSalesData = useMemo(() => {
-    const data = {};
-    filteredOrders.forEach(order => {
-      order.items.forEach(item => {
-        if (!data[item.product_name]) {
-          data[item.product_name] = { name: item.product_name, sales: 0, quantity: 0 };
-        }
-        data[item.product_name].sales += parseFloat(item.price) * item.quantity;
-        data[item.product_name].quantity += item.quantity;
+  const [analytics, setAnalytics] = useState(null);
+  const [error, setError] = useState(null);
+
+  // Everything on this screen is summed on the server for the selected
+  // range, so it covers all of the store's orders, not just loaded pages.
+  useEffect(() => {
+    let cancelled = false;
+    const to = new Date();
+    const from = new Date(to);
+    TIME_FRAMES[timeFrame](from);
+    setAnalytics(null);
+    setError(null);
+    getSalesAnalytics(toISODate(from), toISODate(to))
+      .then(data => { if (!cancelled) setAnalytics(data); })
+      .catch(err => {
+        console.error('Error fetching sales analytics:', err);
+        if (!cancelled) setError('Failed to load sales analytics. Please try again.');
       });
-    });
-    return Object.values(data).sort((a, b) => b.sales - a.sales).slice(0, 5);
-  }, [filteredOrders]);
-
-  const totalRevenue = useMemo(() => 
-    filteredOrders.reduce((sum, order) => sum + parseFloat(order.total_amount), 0),
-    [filteredOrders]
-  );
-
-  const averageOrderValue = useMemo(() => 
-    filteredOrders.length > 0 ? totalRevenue / filteredOrders.length : 0,
-    [filteredOrders, totalRevenue]
-  );
-
-  const orderStatusData = useMemo(() => {
-    const data = {};
-    filteredOrders.forEach(order => {
-      if (!data[order.status]) {
-        data[order.status] = 0;
-      }
-      data[order.status]++;
-    });
-    return Object.entries(data).map(([status, count]) => ({ name: status, value: count }));
-  }, [filteredOrders]);
+    return () => { cancelled = true; };
+  }, [timeFrame]);
+
+  const salesData = useMemo(() => (analytics ? analytics.daily : []).map(day => ({
+    date: day.date,
+    sales: parseFloat(day.revenue),
+    orders: day.order_count,
+  })), [analytics]);
+
+  const productSalesData = useMemo(() => (analytics ? analytics.products : []).slice(0, 5).map(product => ({
+    name: product.product_name,
+    sales: parseFloat(product.revenue),
+    quantity: product.units_sold,
+  })), [analytics]);
+
+  const orderStatusData = useMemo(() => (analytics ? analytics.statuses : []).map(row => ({
+    name: row.status,
+    value: row.count,
+  })), [analytics]);
+
+  const totalRevenue = analytics ? parseFloat(analytics.totals.revenue) : 0;
+  const averageOrderValue = analytics ? parseFloat(analytics.totals.average_order_value) : 0;
+  const totalOrders = analytics ? analytics.totals.order_count : 0;
 
   return (
     <div className="space-y-6 p-4">
@@ -103,6 +94,8 @@ const SalesAnalyticsSection = () => {
         </Select>
       </div>
 
+      {error && <p className="text-red-500">{error}</p>}
+
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
         <StatCard
           title="Total Revenue"
@@ -112,7 +105,7 @@ const SalesAnalyticsSection = () => {
         />
         <StatCard
           title="Total Orders"
-          value={filteredOrders.length}
+          value={totalOrders}
           icon={<ShoppingCart className="w-6 h-6" />}
           color={storeData.primary_color}
         />
@@ -124,7 +117,7 @@ const SalesAnalyticsSection = () => {
         />
         <StatCard
           title="Total Products"
-          value={products.length}
+          value={productCount}
           icon={<Package className="w-6 h-6" />}
           color={storeData.primary_color}
         />
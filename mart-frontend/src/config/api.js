@@ -215,6 +215,17 @@ export const uploadPaymentProof = async (trackingNumber, formData, method = 'POS
   }
 };
 
+// Payment proofs are only served to the store owner, with the access token,
+// so they cannot be linked to directly; display the blob from an object URL.
+export const getPaymentProof = async (url) => {
+  try {
+    const response = await api.get(url, { responseType: 'blob' });
+    return response.data;
+  } catch (error) {
+    throw error.response ? error.response.data : new Error('An error occurred while fetching the payment proof');
+  }
+};
+
 export const trackOrder = async (trackingNumber) => {
   try {
     const response = await api.get(`/orders/track/${trackingNumber}/`);
@@ -229,7 +240,9 @@ export const updateProfile = (data) => api.put('/accounts/profile/', data);
 export const getStoreDetails = () => cacheGet('/stores/store/detail/');
 export const createStore = (data) => api.post('/stores/store/', data);
 export const updateStore = (data) => api.put('/stores/store/detail/', data);
-export const getProducts = () => cacheGet('/stores/products/');
+// Keyset-paginated listings return one page, `{ results, next }`; pass the
+// `next` link back in to fetch the page after it.
+export const getProducts = (url = '/stores/products/') => cacheGet(url);
 export const createProduct = (data) => api.post('/stores/products/', data);
 export const updateProduct = (id, data) => api.put(`/stores/products/${id}/`, data);
 export const deleteProduct = (id) => api.delete(`/stores/products/${id}/`);
@@ -237,7 +250,17 @@ export const getBankDetails = () => cacheGet('/stores/bank-details/list/');
 export const createBankDetail = (data) => api.post('/stores/bank-details/', data);
 export const updateBankDetail = (id, data) => api.put(`/stores/bank-details/${id}/`, data);
 export const deleteBankDetail = (id) => api.delete(`/stores/bank-details/${id}/`);
-export const getOrders = () => cacheGet('/orders/list/');
+export const getOrders = (url = '/orders/list/') => cacheGet(url);
 export const getOrderDetails = (id) => cacheGet(`/orders/${id}/`);
+// Sales totals, daily series and per-product figures for the vendor's store,
+// summed on the server. `from` and `to` are inclusive YYYY-MM-DD dates.
+export const getSalesAnalytics = async (from, to) => {
+  try {
+    const response = await api.get('/stores/analytics/', { params: { from, to } });
+    return response.data;
+  } catch (error) {
+    throw error.response ? error.response.data : new Error('An error occurred while fetching sales analytics');
+  }
+};
 
 export default api;
\ No newline at end of file
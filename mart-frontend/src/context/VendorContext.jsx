@@ -11,8 +11,11 @@ export const VendorProvider = ({ children }) => {
   const [user, setUser] = useState(null);
   const [storeData, setStoreData] = useState(null);
   const [products, setProducts] = useState([]);
+  const [productsNext, setProductsNext] = useState(null);
+  const [productCount, setProductCount] = useState(0);
   const [bankDetails, setBankDetails] = useState([]);
   const [orders, setOrders] = useState([]);
+  const [ordersNext, setOrdersNext] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -26,20 +29,26 @@ export const VendorProvider = ({ children }) => {
         const store = await api.getStoreDetails();
         setStoreData(store);
 
-        const [productList, bankDetailsList, orderList] = await Promise.all([
+        const [productPage, bankDetailsList, orderPage] = await Promise.all([
           api.getProducts(),
           api.getBankDetails(),
           api.getOrders(),
         ]);
-        setProducts(productList);
+        setProducts(productPage.results);
+        setProductsNext(productPage.next);
+        setProductCount(productPage.count);
         setBankDetails(bankDetailsList);
-        setOrders(orderList);
+        setOrders(orderPage.results);
+        setOrdersNext(orderPage.next);
       } catch (err) {
         if (err.response && err.response.status === 404) {
           setStoreData(null);
           setProducts([]);
+          setProductsNext(null);
+          setProductCount(0);
           setBankDetails([]);
           setOrders([]);
+          setOrdersNext(null);
         } else {
           throw err;
         }
@@ -83,6 +92,7 @@ export const VendorProvider = ({ children }) => {
     try {
       const newProduct = await api.createProduct(data);
       setProducts(prevProducts => [...prevProducts, newProduct]);
+      setProductCount(count => count + 1);
     } catch (error) {
       console.error('Error adding product:', error);
       throw error;
@@ -93,12 +103,30 @@ export const VendorProvider = ({ children }) => {
     try {
       await api.deleteProduct(id);
       setProducts(prevProducts => prevProducts.filter(product => product.id !== id));
+      setProductCount(count => count - 1);
     } catch (error) {
       console.error('Error deleting product:', error);
       throw error;
     }
   }, []);
 
+  // Only the newest page of products and orders is loaded up front; the
+  // dashboard lists fetch older pages on demand. Totals come from the server
+  // (productCount, and the sales analytics endpoint), never from these lists.
+  const loadMoreProducts = useCallback(async () => {
+    if (!productsNext) return;
+    const page = await api.getProducts(productsNext);
+    setProducts(prevProducts => [...prevProducts, ...page.results]);
+    setProductsNext(page.next);
+  }, [productsNext]);
+
+  const loadMoreOrders = useCallback(async () => {
+    if (!ordersNext) return;
+    const page = await api.getOrders(ordersNext);
+    setOrders(prevOrders => [...prevOrders, ...page.results]);
+    setOrdersNext(page.next);
+  }, [ordersNext]);
+
   const value = {
     user,
     setUser,
@@ -106,10 +134,16 @@ export const VendorProvider = ({ children }) => {
     setStoreData,
     products,
     setProducts,
+    productsNext,
+    productCount,
+    loadMoreProducts,
     bankDetails,
     setBankDetails,
     orders,
     setOrders,
+    ordersNext,
+    setOrdersNext,
+    loadMoreOrders,
     isLoading,
     error,
     fetchInitialData,
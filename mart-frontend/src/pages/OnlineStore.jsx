@@ -13,7 +13,7 @@ import SaveInfoModal from '../components/VendorLanding/SaveInfoModal';
 import OptionsModal from '../components/VendorLanding/OptionsModal';
 import ProductModal from '../components/VendorLanding/ProductModal';
 import { createOrder } from '../config/api';
-const OnlineStore = ({ storeData }) => {
+const OnlineStore = ({ storeData, hasMoreProducts, onLoadMoreProducts, isLoadingMoreProducts }) => {
   const [cartItems, setCartItems] = useState([]);
   const [isCartOpen, setIsCartOpen] = useState(false);
   const [isBankDetailsOpen, setIsBankDetailsOpen] = useState(false);
@@ -240,6 +240,19 @@ const OnlineStore = ({ storeData }) => {
         storeSlug={storeData.slug}
       />
 
+      {hasMoreProducts && (
+        <div className="flex justify-center pb-16" style={styles.secondary}>
+          <button
+            onClick={onLoadMoreProducts}
+            disabled={isLoadingMoreProducts}
+            className="px-6 py-2 rounded-lg font-semibold disabled:opacity-50"
+            style={styles.primary}
+          >
+            {isLoadingMoreProducts ? 'Loading...' : 'Load more products'}
+          </button>
+        </div>
+      )}
+
       <ShoppingCart
         isOpen={isCartOpen}
         setIsOpen={setIsCartOpen}
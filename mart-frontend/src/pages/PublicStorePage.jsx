@@ -10,6 +10,7 @@ export default function PublicStorePage() {
   const [storeData, setStoreData] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchStoreData = async () => {
@@ -27,6 +28,25 @@ export default function PublicStorePage() {
     fetchStoreData();
   }, [slug]);
 
+  // The storefront carries the first page of products; later pages are only
+  // fetched when the customer asks for them.
+  const loadMoreProducts = async () => {
+    if (!storeData.products_next || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await axios.get(storeData.products_next);
+      setStoreData(prev => ({
+        ...prev,
+        products: prev.products.concat(page.data.results),
+        products_next: page.data.next,
+      }));
+    } catch (err) {
+      console.error('Error fetching more products:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   if (isLoading) {
     return (
       <div className="flex items-center justify-center h-screen">
@@ -45,7 +65,12 @@ export default function PublicStorePage() {
   }
 
   return storeData ? (
-    <OnlineStore storeData={storeData} />
+    <OnlineStore
+      storeData={storeData}
+      hasMoreProducts={Boolean(storeData.products_next)}
+      onLoadMoreProducts={loadMoreProducts}
+      isLoadingMoreProducts={isLoadingMore}
+    />
   ) : (
     <div className="text-center py-10">Store not found.</div>
   );
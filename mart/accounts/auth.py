@@ -1,3 +1,5 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.response import Response
 from rest_framework import status
@@ -27,4 +29,19 @@ class CookieTokenRefreshView(TokenRefreshView):
         if refresh_token:
             request.data['refresh'] = refresh_token
         response = super().post(request, *args, **kwargs)
-        return response
\ No newline at end of file
+        return response
+
+class VendorClaimsAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the vendor claims added at login instead of
+    fetching the user row. ``request.user`` is a TokenUser, so views using it
+    should only read ``id``, ``is_vendor``, ``is_email_verified`` and
+    ``store_id``. Tokens issued before the claims existed fall back to the
+    regular database lookup.
+    """
+    claims = ('is_vendor', 'is_email_verified', 'store_id')
+
+    def get_user(self, validated_token):
+        if all(claim in validated_token for claim in self.claims):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        return super().get_user(validated_token)
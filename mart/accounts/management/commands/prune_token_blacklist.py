@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted refresh tokens in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per transaction')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lt=cutoff).order_by('pk')
+        outstanding = blacklisted = 0
+        while True:
+            # Expired tokens are the oldest ones, so walking the primary key
+            # finds each batch without an index on expires_at.
+            ids = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            # Blacklist rows go with their outstanding token (on_delete=CASCADE).
+            _, deleted = OutstandingToken.objects.filter(pk__in=ids).delete()
+            outstanding += deleted.get('token_blacklist.OutstandingToken', 0)
+            blacklisted += deleted.get('token_blacklist.BlacklistedToken', 0)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {outstanding} outstanding and {blacklisted} blacklisted token(s) expired before {cutoff}'
+        ))
@@ -1,6 +1,10 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from .tokens import CachedRefreshToken
 from .utils import send_verification_email
 
 User = get_user_model()
@@ -19,6 +23,7 @@ class UserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You must accept the Terms and Conditions to register.")
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
         send_verification_email(user)
@@ -33,10 +38,39 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+def add_vendor_claims(token, user):
+    """Claims that let vendor endpoints authorize without loading the user (see accounts.auth)."""
+    store = getattr(user, 'store', None)
+    token['is_vendor'] = user.is_vendor
+    token['is_email_verified'] = user.is_email_verified
+    token['store_id'] = store.pk if store else None
+    return token
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = CachedRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_vendor_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         if not self.user.is_email_verified:
             raise serializers.ValidationError("Email is not verified.")
         data['is_vendor'] = self.user.is_vendor
-        return data
\ No newline at end of file
+        return data
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = CachedRefreshToken
+
+    def validate(self, attrs):
+        # Re-read the claims on every refresh, so a store created or a vendor
+        # flag revoked since login reaches the next access token.
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.select_related('store').filter(
+            is_active=True, **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is None:
+            raise AuthenticationFailed("User not found", code='user_not_found')
+        add_vendor_claims(refresh, user)
+        return super().validate({**attrs, 'refresh': str(refresh)})
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+TOKEN_CACHE_ALIAS = getattr(settings, 'TOKEN_CACHE_ALIAS', 'tokens')
+
+
+def token_cache():
+    """The cache holding one entry per refresh token, apart from the storefront and order caches."""
+    return caches[TOKEN_CACHE_ALIAS]
+
+
+def _blacklist_key(jti):
+    return f'token_blacklist:{jti}'
+
+
+def remember_jti(jti, blacklisted):
+    """Record whether a refresh token is blacklisted until it would have expired anyway."""
+    token_cache().set(_blacklist_key(jti), blacklisted, api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check is answered from the cache.
+
+    Every jti issued here is recorded as not blacklisted, and blacklisting
+    any token flips the entry (see accounts.signals). A refresh therefore
+    only reaches the blacklist tables when the entry has been evicted, no
+    matter how large they grow. This relies on the cache being shared by
+    all worker processes.
+    """
+
+    def set_jti(self):
+        super().set_jti()
+        remember_jti(self[api_settings.JTI_CLAIM], False)
+
+    def check_blacklist(self):
+        jti = self[api_settings.JTI_CLAIM]
+        blacklisted = token_cache().get(_blacklist_key(jti))
+        if blacklisted is None:
+            # Unknown to the cache: ask the database, but only keep a positive
+            # answer, which cannot be raced by a concurrent blacklisting.
+            try:
+                super().check_blacklist()
+            except TokenError:
+                remember_jti(jti, True)
+                raise
+        elif blacklisted:
+            raise TokenError(_("Token is blacklisted"))
@@ -1,7 +1,7 @@
-from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from email_management.utils import queue_email
 from .models import EmailVerificationToken
 
 def send_verification_email(user):
@@ -14,13 +14,11 @@ def send_verification_email(user):
     html_message = render_to_string('email/verification_email.html', context)
     plain_message = strip_tags(html_message)
     
-    send_mail(
+    queue_email(
         'Verify your email',
         plain_message,
-        settings.DEFAULT_FROM_EMAIL,
         [user.email],
         html_message=html_message,
-        fail_silently=False,
     )
 
     return token
\ No newline at end of file
@@ -1,9 +1,10 @@
 from django.contrib import admin
-from django.core.mail import send_mass_mail
 from django.contrib import messages
 from django.shortcuts import render
+from django.utils import timezone
 from django import forms
-from .models import EmailTemplate, EmailLog
+from .models import EmailTemplate, EmailLog, QueuedEmail
+from .utils import queue_campaign
 from accounts.models import User
 
 class VendorSelectForm(forms.Form):
@@ -21,8 +22,7 @@ class EmailTemplateAdmin(admin.ModelAdmin):
 
     def send_to_all_vendors(self, request, queryset):
         for template in queryset:
-            vendors = User.objects.filter(is_vendor=True, is_email_verified=True)
-            self._send_emails(request, template, vendors)
+            self._send_emails(request, template, None)
     send_to_all_vendors.short_description = "Send selected template to all vendors"
 
     def send_to_selected_vendors(self, request, queryset):
@@ -44,18 +44,39 @@ class EmailTemplateAdmin(admin.ModelAdmin):
     send_to_selected_vendors.short_description = "Send selected template to specific vendors"
 
     def _send_emails(self, request, template, recipients):
-        emails = [(template.subject, template.body, None, [user.email]) for user in recipients]
-        send_mass_mail(emails, fail_silently=False)
-        email_log = EmailLog.objects.create(template=template, subject=template.subject, body=template.body)
-        email_log.recipients.set(recipients)
-        self.message_user(request, f"Emails sent successfully to {recipients.count()} vendors.", messages.SUCCESS)
+        log = queue_campaign(template, recipients)
+        self.message_user(
+            request,
+            f"Campaign queued for {log.total_recipients} vendors. Track its progress under Email logs.",
+            messages.SUCCESS
+        )
 
 @admin.register(EmailLog)
 class EmailLogAdmin(admin.ModelAdmin):
-    list_display = ('template', 'sent_at', 'recipient_count')
-    list_filter = ('sent_at', 'template')
+    list_display = ('template', 'sent_at', 'status', 'progress', 'failed_count', 'finished_at')
+    list_filter = ('status', 'sent_at', 'template')
     search_fields = ('subject', 'body')
+    readonly_fields = (
+        'status', 'total_recipients', 'sent_count', 'failed_count', 'last_error',
+        'last_recipient_id', 'claimed_at', 'finished_at'
+    )
+    raw_id_fields = ('recipients',)
+
+    def progress(self, obj):
+        return f"{obj.sent_count + obj.failed_count} / {obj.total_recipients}"
+    progress.short_description = 'Processed / Recipients'
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ('to', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to', 'subject')
+    readonly_fields = ('claim_token', 'claimed_at', 'created_at', 'sent_at', 'last_error')
+
+    actions = ['retry_now']
 
-    def recipient_count(self, obj):
-        return obj.recipients.count()
-    recipient_count.short_description = 'Number of Recipients'
\ No newline at end of file
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        self.message_user(request, f"{updated} email(s) queued for another attempt.", messages.SUCCESS)
+    retry_now.short_description = "Retry selected emails now"
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from email_management.utils import claim_emails, deliver_emails
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails, retrying failures with exponential backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails claimed per batch')
+        parser.add_argument('--sleep', type=float, default=5, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            emails = claim_emails(options['batch_size'])
+            if emails:
+                sent, failed = deliver_emails(emails)
+                self.stdout.write(f'Sent {sent} email(s), {failed} failed')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
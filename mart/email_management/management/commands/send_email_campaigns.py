@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from email_management.utils import EMAIL_CAMPAIGN_CHUNK_SIZE, claim_campaign, run_campaign
+
+
+class Command(BaseCommand):
+    help = 'Send queued email campaigns to their vendors in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=EMAIL_CAMPAIGN_CHUNK_SIZE,
+                            help='Recipients sent per SMTP connection')
+        parser.add_argument('--sleep', type=float, default=30, help='Seconds to wait when no campaign is queued')
+        parser.add_argument('--once', action='store_true', help='Run the queued campaigns once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            log = claim_campaign()
+            if log is not None:
+                run_campaign(log, options['chunk_size'])
+                log.refresh_from_db()
+                self.stdout.write(
+                    f'Campaign {log.pk}: {log.sent_count} sent, {log.failed_count} failed '
+                    f'of {log.total_recipients}'
+                )
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
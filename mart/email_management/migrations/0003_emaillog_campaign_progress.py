@@ -0,0 +1,69 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+def mark_existing_logs_completed(apps, schema_editor):
+    # Logs written before campaigns were queued were sent synchronously.
+    EmailLog = apps.get_model('email_management', 'EmailLog')
+    for log in EmailLog.objects.all():
+        total = log.recipients.count()
+        EmailLog.objects.filter(pk=log.pk).update(
+            status='completed', total_recipients=total, sent_count=total, finished_at=log.sent_at
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_management', '0002_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emaillog',
+            name='all_vendors',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='failed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='last_recipient_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='sent_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed')], default='queued', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='total_recipients',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(mark_existing_logs_completed, migrations.RunPython.noop),
+    ]
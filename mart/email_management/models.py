@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class EmailTemplate(models.Model):
     name = models.CharField(max_length=100)
@@ -12,11 +13,66 @@ class EmailTemplate(models.Model):
         return self.name
 
 class EmailLog(models.Model):
+    """
+    A campaign sent from EmailTemplateAdmin. Campaigns to all vendors link
+    their recipients as the send_email_campaigns job reaches them; campaigns
+    to selected vendors link them when queued.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+
     template = models.ForeignKey(EmailTemplate, on_delete=models.SET_NULL, null=True)
     recipients = models.ManyToManyField(settings.AUTH_USER_MODEL)
     sent_at = models.DateTimeField(auto_now_add=True)
     subject = models.CharField(max_length=200)
     body = models.TextField()
+    all_vendors = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total_recipients = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    last_recipient_id = models.BigIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Email sent on {self.sent_at}"
+
+class QueuedEmail(models.Model):
+    """
+    Outbox row for an email that is sent by the process_email_queue worker
+    instead of inside the request that produced it.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['claim_token']),
+        ]
 
     def __str__(self):
-        return f"Email sent on {self.sent_at}"
\ No newline at end of file
+        return f"{self.subject} -> {self.to} ({self.status})"
@@ -0,0 +1,206 @@
+from datetime import timedelta
+from uuid import uuid4
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from accounts.models import User
+from mart import metrics
+from .models import QueuedEmail, EmailLog
+
+EMAIL_QUEUE_MAX_ATTEMPTS = getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+EMAIL_QUEUE_RETRY_DELAY = getattr(settings, 'EMAIL_QUEUE_RETRY_DELAY', 60)
+EMAIL_QUEUE_CLAIM_TIMEOUT = getattr(settings, 'EMAIL_QUEUE_CLAIM_TIMEOUT', 600)
+EMAIL_CAMPAIGN_CHUNK_SIZE = getattr(settings, 'EMAIL_CAMPAIGN_CHUNK_SIZE', 500)
+
+
+def _open_connection():
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception:
+        # Each send() retries the connection and records its own failure.
+        pass
+    return connection
+
+
+def queue_email(subject, message, recipient_list, html_message=None, from_email=None):
+    """
+    Store an email in the outbox. Call it inside the transaction that creates
+    the data the email refers to, so both are committed or neither is.
+    """
+    return QueuedEmail.objects.bulk_create([
+        QueuedEmail(
+            subject=subject,
+            body=message,
+            html_body=html_message or '',
+            from_email=from_email or '',
+            to=recipient,
+        )
+        for recipient in recipient_list
+    ])
+
+
+def _due_filter(now):
+    # Pending rows that are due, plus rows whose worker died mid-batch.
+    return (
+        Q(status='pending', next_attempt_at__lte=now)
+        | Q(status='sending', claimed_at__lt=now - timedelta(seconds=EMAIL_QUEUE_CLAIM_TIMEOUT))
+    )
+
+
+def claim_emails(batch_size):
+    """
+    Claim up to ``batch_size`` due emails for this worker.
+
+    The claim is a conditional UPDATE that re-checks the row state, so when
+    several workers pick the same candidates each row goes to exactly one.
+    """
+    now = timezone.now()
+    candidates = list(
+        QueuedEmail.objects.filter(_due_filter(now))
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+    token = uuid4().hex
+    QueuedEmail.objects.filter(_due_filter(now), pk__in=candidates).update(
+        status='sending', claim_token=token, claimed_at=now
+    )
+    return list(QueuedEmail.objects.filter(claim_token=token, status='sending'))
+
+
+def deliver_emails(emails):
+    """Send claimed emails over one SMTP connection and record the outcome of each."""
+    sent = failed = 0
+    connection = _open_connection()
+    try:
+        for email in emails:
+            message = EmailMultiAlternatives(
+                email.subject,
+                email.body,
+                email.from_email or settings.DEFAULT_FROM_EMAIL,
+                [email.to],
+                connection=connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, 'text/html')
+            email.attempts += 1
+            try:
+                message.send()
+            except Exception as e:
+                failed += 1
+                email.last_error = str(e)
+                if email.attempts >= EMAIL_QUEUE_MAX_ATTEMPTS:
+                    email.status = 'failed'
+                else:
+                    email.status = 'pending'
+                    email.next_attempt_at = timezone.now() + timedelta(
+                        seconds=EMAIL_QUEUE_RETRY_DELAY * 2 ** (email.attempts - 1)
+                    )
+            else:
+                sent += 1
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+            email.claim_token = ''
+            email.save(update_fields=[
+                'status', 'attempts', 'last_error', 'next_attempt_at', 'claim_token', 'sent_at'
+            ])
+    finally:
+        connection.close()
+    metrics.inc('mart_emails_sent_total', sent, source='outbox')
+    metrics.inc('mart_emails_failed_total', failed, source='outbox')
+    return sent, failed
+
+
+def vendor_recipients():
+    return User.objects.filter(is_vendor=True, is_email_verified=True)
+
+
+def queue_campaign(template, recipients=None):
+    """
+    Record a campaign for send_email_campaigns. ``recipients`` is a queryset
+    of users; leave it out to target every verified vendor at send time.
+    """
+    log = EmailLog.objects.create(
+        template=template,
+        subject=template.subject,
+        body=template.body,
+        all_vendors=recipients is None,
+        total_recipients=(vendor_recipients() if recipients is None else recipients).count(),
+    )
+    if recipients is not None:
+        Link = EmailLog.recipients.through
+        Link.objects.bulk_create(
+            (Link(emaillog_id=log.pk, user_id=pk) for pk in recipients.values_list('pk', flat=True).iterator()),
+            batch_size=EMAIL_CAMPAIGN_CHUNK_SIZE,
+        )
+    return log
+
+
+def claim_campaign():
+    """Claim the oldest runnable campaign, or return None. Stalled campaigns resume where they stopped."""
+    now = timezone.now()
+    runnable = Q(status='queued') | Q(
+        status='running', claimed_at__lt=now - timedelta(seconds=EMAIL_QUEUE_CLAIM_TIMEOUT)
+    )
+    for pk in EmailLog.objects.filter(runnable).order_by('pk').values_list('pk', flat=True)[:5]:
+        if EmailLog.objects.filter(runnable, pk=pk).update(status='running', claimed_at=now):
+            return EmailLog.objects.get(pk=pk)
+    return None
+
+
+def run_campaign(log, chunk_size=EMAIL_CAMPAIGN_CHUNK_SIZE):
+    """Stream the campaign's recipients in chunks, sending each chunk over one SMTP connection."""
+    recipients = vendor_recipients() if log.all_vendors else log.recipients.all()
+    recipients = recipients.filter(pk__gt=log.last_recipient_id).order_by('pk').only('pk', 'email')
+
+    chunk = []
+    for user in recipients.iterator(chunk_size=chunk_size):
+        chunk.append(user)
+        if len(chunk) == chunk_size:
+            _send_campaign_chunk(log, chunk)
+            chunk = []
+    if chunk:
+        _send_campaign_chunk(log, chunk)
+
+    EmailLog.objects.filter(pk=log.pk).update(status='completed', finished_at=timezone.now())
+
+
+def _send_campaign_chunk(log, users):
+    """
+    Send to ``users`` over one SMTP connection. Progress is saved after each
+    recipient, so a crashed run resumes after the last email it handed over
+    instead of re-sending the rest of the chunk.
+    """
+    connection = _open_connection()
+    try:
+        for user in users:
+            error = ''
+            try:
+                EmailMessage(log.subject, log.body, None, [user.email], connection=connection).send()
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            _record_campaign_send(log, user, error)
+    finally:
+        connection.close()
+
+
+@transaction.atomic
+def _record_campaign_send(log, user, error):
+    outcome = 'failed' if error else 'sent'
+    metrics.inc(f'mart_emails_{outcome}_total', source='campaign')
+    if log.all_vendors:
+        Link = EmailLog.recipients.through
+        Link.objects.bulk_create([Link(emaillog_id=log.pk, user_id=user.pk)], ignore_conflicts=True)
+    progress = {
+        f'{outcome}_count': F(f'{outcome}_count') + 1,
+        'last_recipient_id': user.pk,
+        'claimed_at': timezone.now(),
+    }
+    if error:
+        progress['last_error'] = error
+    EmailLog.objects.filter(pk=log.pk).update(**progress)
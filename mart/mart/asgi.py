@@ -9,8 +9,21 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mart.settings')
 
-application = get_asgi_application()
+
+class MartASGIHandler(ASGIHandler):
+    """Resolve every request against mart.urls_async, which serves the public read endpoints from async views."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = 'mart.urls_async'
+        return request, error_response
+
+
+django.setup(set_prefix=False)
+application = MartASGIHandler()
@@ -0,0 +1,98 @@
+"""
+Async versions of the public read endpoints, served by the ASGI application
+through mart.urls_async. They load everything up front with the async ORM
+and hand fully-fetched instances to the same serializers as the DRF views,
+so both paths return the same JSON.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from orders.cache import etag_matches, get_order_status
+from orders.models import Order
+from orders.serializers import OrderSerializer
+from site_settings.models import SiteSettings
+from .renderers import FastJSONRenderer
+from site_settings.serializers import SiteSettingsSerializer
+from stores.cache import get_cached_storefront, get_storefront_version, set_cached_storefront, record_storefront_visit
+from stores.models import Product, Store
+from stores.pagination import KeysetPagination
+from stores.serializers import RecentStoreSerializer
+from stores.views import PublicStoreProductsView, storefront_data
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def not_found(model):
+    return json_response({'detail': f'No {model._meta.object_name} matches the given query.'}, status=404)
+
+
+class AsyncReadView(View):
+    http_method_names = ['get', 'head', 'options']
+
+
+class PublicStoreView(AsyncReadView):
+    async def get(self, request, slug):
+        base_url = request.build_absolute_uri('/')
+        store_id, version, data = await sync_to_async(get_cached_storefront)(slug, base_url)
+        if data is None:
+            stores = Store.objects.filter(is_active=True)
+            if store_id is None:
+                store_id = await stores.filter(slug=slug).values_list('pk', flat=True).afirst()
+                if store_id is None:
+                    return not_found(Store)
+                version = await sync_to_async(get_storefront_version)(store_id)
+            try:
+                store = await stores.prefetch_related('bank_details').aget(slug=slug)
+            except Store.DoesNotExist:
+                return not_found(Store)
+            paginator = KeysetPagination()
+            paginator.ordering = PublicStoreProductsView.ordering
+            products = await paginator.apaginate(Product.objects.filter(store=store))
+            data = storefront_data(request, store, products, paginator)
+            if store.pk == store_id:
+                await sync_to_async(set_cached_storefront)(store, version, base_url, data)
+            store_id = store.pk
+        await sync_to_async(record_storefront_visit)(store_id)
+        return json_response(data)
+
+
+class RecentStoresView(AsyncReadView):
+    async def get(self, request):
+        try:
+            limit = int(request.GET.get('limit', 6))
+        except ValueError:
+            limit = 6
+        stores = [store async for store in Store.objects.filter(is_active=True).order_by('-created_at')[:limit]]
+        return json_response(RecentStoreSerializer(stores, many=True, context={'request': request}).data)
+
+
+class SiteSettingsView(AsyncReadView):
+    async def get(self, request):
+        site_settings = await SiteSettings.objects.prefetch_related('social_links').afirst()
+        return json_response(SiteSettingsSerializer(site_settings, context={'request': request}).data)
+
+
+class TrackOrderView(AsyncReadView):
+    async def get(self, request, tracking_number):
+        try:
+            order = await Order.objects.with_items().aget(tracking_number=tracking_number)
+        except Order.DoesNotExist:
+            return not_found(Order)
+        return json_response(OrderSerializer(order, context={'request': request}).data)
+
+
+class OrderStatusView(AsyncReadView):
+    async def get(self, request, tracking_number):
+        cached = await sync_to_async(get_order_status)(tracking_number)
+        if cached is None:
+            return json_response({'error': 'Order not found'}, status=404)
+        etag, data = cached
+        if etag_matches(etag, request.headers.get('If-None-Match', '')):
+            response = HttpResponse(status=304)
+        else:
+            response = json_response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,85 @@
+"""
+Compression of API responses: brotli when the client accepts it and the
+Brotli package is installed, gzip otherwise. Only whole bodies of the
+COMPRESSION_CONTENT_TYPES at least COMPRESSION_MIN_SIZE long are
+compressed; streaming responses (exports, media files and their byte
+ranges) pass through as they are.
+"""
+import re
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_SIZE = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+COMPRESSION_CONTENT_TYPES = getattr(settings, 'COMPRESSION_CONTENT_TYPES', ['application/json'])
+COMPRESSION_BROTLI_QUALITY = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4)
+
+# As Django's GZipMiddleware: random padding in the gzip header, against BREACH.
+GZIP_MAX_RANDOM_BYTES = 100
+
+REFUSED_RE = re.compile(r'\s*q\s*=\s*0(\.0*)?\s*$')
+
+
+def accepted_encodings(header):
+    """Content codings named in an Accept-Encoding header, less any refused with ``q=0``."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        if not REFUSED_RE.match(params):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress(content, accepted):
+    """``(encoding, compressed content)`` in the best coding the client accepts, or None."""
+    if brotli is not None and 'br' in accepted:
+        return 'br', brotli.compress(content, quality=COMPRESSION_BROTLI_QUALITY)
+    if 'gzip' in accepted:
+        return 'gzip', compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+    return None
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        # A few milliseconds of CPU at most, cheaper on the event loop than a thread hop.
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < COMPRESSION_MIN_SIZE:
+            return response
+        if response.get('Content-Type', '').split(';')[0].strip() not in COMPRESSION_CONTENT_TYPES:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = compress(response.content, accepted_encodings(request.headers.get('Accept-Encoding', '')))
+        if compressed is None or len(compressed[1]) >= len(response.content):
+            return response
+        encoding, response.content = compressed
+        response['Content-Length'] = str(len(response.content))
+        response['Content-Encoding'] = encoding
+        # The compressed body is a different representation; as GZipMiddleware, weaken the ETag.
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        return response
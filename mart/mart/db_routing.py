@@ -0,0 +1,115 @@
+import random
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DATABASE_REPLICAS = getattr(settings, 'DATABASE_REPLICAS', [])
+REPLICA_URL_NAMES = set(getattr(settings, 'REPLICA_URL_NAMES', []))
+REPLICA_STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+PRIMARY_COOKIE = 'use_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_request = ContextVar('replica_request', default=None)
+
+
+def replica_for(request):
+    """
+    The replica for this request's reads, or None for the primary. Decided on
+    the first read after URL resolution, and dropped for the rest of the
+    request once it writes.
+    """
+    if not hasattr(request, '_replica'):
+        match = request.resolver_match
+        if match is None:
+            return None
+        eligible = (
+            request.method in SAFE_METHODS
+            and match.url_name in REPLICA_URL_NAMES
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and not pinned_to_primary(request)
+        )
+        request._replica = random.choice(DATABASE_REPLICAS) if eligible else None
+    return request._replica
+
+
+def pinned_to_primary(request):
+    try:
+        return int(request.COOKIES.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica picked for the current request by replica_for(),
+    everything else to the primary. Once the request writes, or while a
+    transaction is open on the primary, reads stay on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        request = _request.get()
+        if request is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica_for(request)
+
+    def db_for_write(self, model, **hints):
+        request = _request.get()
+        if request is not None:
+            request._replica = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of the primary, so rows from either can be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in DATABASE_REPLICAS
+
+
+class ReplicaMiddleware:
+    """
+    Make the request visible to ReplicaRouter, which sends anonymous safe
+    requests for the views in REPLICA_URL_NAMES to a random replica. A client
+    that has just written gets a short-lived cookie that keeps its reads on
+    the primary for REPLICA_STICKY_SECONDS, longer than the replicas are
+    expected to lag, so it always sees its own writes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = _request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request.reset(token)
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_COOKIE, str(int(time.time()) + REPLICA_STICKY_SECONDS), max_age=REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='None', secure=True,
+            )
+        return response
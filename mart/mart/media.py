@@ -0,0 +1,143 @@
+"""
+Media responses. Views decide who may see a file; send_file names it and
+either hands the transfer to the web server (MEDIA_SENDFILE) or streams it
+from Django, with conditional requests, byte ranges and the Cache-Control
+of its media class (MEDIA_CACHE_CONTROL).
+
+For nginx, map each media root to an internal location, as in
+MEDIA_ACCEL_REDIRECT_LOCATIONS::
+
+    location /_media/ { internal; alias /srv/mart/media/; }
+    location /_private_media/ { internal; alias /srv/mart/private_media/; }
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+MEDIA_SENDFILE = getattr(settings, 'MEDIA_SENDFILE', '')
+MEDIA_ACCEL_REDIRECT_LOCATIONS = getattr(settings, 'MEDIA_ACCEL_REDIRECT_LOCATIONS', {settings.MEDIA_ROOT: '/_media/'})
+MEDIA_CACHE_CONTROL = getattr(settings, 'MEDIA_CACHE_CONTROL', {})
+
+# Public uploads that may still sit under MEDIA_ROOT from before payment
+# proofs moved to private storage; dedupe_media moves them out.
+PRIVATE_PREFIXES = ('payment_proofs/',)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def byte_range(header, size):
+    """
+    ``(start, stop)`` of a single ``bytes=`` range, None to send the whole
+    file (no range, several ranges, or one that is malformed), or False if
+    it cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        stop = min(int(last) + 1, size) if last else size
+    else:
+        start, stop = max(size - int(last), 0), size
+    if start >= stop:
+        return False
+    return start, stop
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(STREAM_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def offloaded(path, content_type):
+    """An empty response telling the web server which file to send; it handles ranges itself."""
+    response = HttpResponse(content_type=content_type)
+    if MEDIA_SENDFILE == 'x-sendfile':
+        response['X-Sendfile'] = path
+        return response
+    for root, location in MEDIA_ACCEL_REDIRECT_LOCATIONS.items():
+        relative = os.path.relpath(path, root)
+        if relative != os.pardir and not relative.startswith(os.pardir + os.sep):
+            response['X-Accel-Redirect'] = quote(location + relative.replace(os.sep, '/'))
+            return response
+    raise ValueError(f'{path} is outside every MEDIA_ACCEL_REDIRECT_LOCATIONS root')
+
+
+def streamed(request, path, size, content_type, etag, last_modified):
+    requested = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if requested and if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        # The client's copy is stale; a slice of the new file would corrupt it.
+        requested = None
+    span = byte_range(requested, size) if requested else None
+    if span is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if span is None:
+        return FileResponse(open(path, 'rb'), content_type=content_type)
+    start, stop = span
+    response = StreamingHttpResponse(read_range(path, start, stop - start), status=206, content_type=content_type)
+    response['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+    response['Content-Length'] = stop - start
+    return response
+
+
+def send_file(request, storage, name, media_class):
+    try:
+        path = storage.path(name)
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+    if not os.path.isfile(path):
+        raise Http404('File not found')
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if MEDIA_SENDFILE:
+            response = offloaded(path, content_type)
+        else:
+            response = streamed(request, path, stat.st_size, content_type, etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = MEDIA_CACHE_CONTROL.get(media_class, 'no-cache')
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Public uploads under MEDIA_URL: content-addressed blobs, image variants and older uploads."""
+    # Checked on the normalized path: "./payment_proofs/..." or
+    # "blobs/../payment_proofs/..." must not get past the private prefixes,
+    # nor pick up another media class's Cache-Control.
+    normalized = posixpath.normpath(path)
+    if normalized.startswith('/') or set(normalized.split('/')) & {'.', '..', ''}:
+        raise Http404('File not found')
+    if normalized.startswith(PRIVATE_PREFIXES):
+        raise Http404('File not found')
+    path = normalized
+    top = path.split('/', 1)[0]
+    return send_file(request, default_storage, path, top if top in ('blobs', 'variants') else 'media')
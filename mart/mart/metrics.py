@@ -0,0 +1,214 @@
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from collections import defaultdict
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = getattr(settings, 'METRICS_ENABLED', False)
+METRICS_DB_PATH = getattr(settings, 'METRICS_DB_PATH', os.path.join(settings.BASE_DIR, 'metrics.sqlite3'))
+METRICS_FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1)
+METRICS_TOKEN = getattr(settings, 'METRICS_TOKEN', '')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# name: (type, help)
+METRICS = {
+    'mart_http_requests_total': ('counter', 'HTTP requests by URL name, method and status code'),
+    'mart_http_errors_total': ('counter', 'HTTP requests answered with a 5xx status'),
+    'mart_http_request_duration_seconds': ('histogram', 'Time to build the HTTP response'),
+    'mart_orders_created_total': ('counter', 'Orders committed by checkout'),
+    'mart_checkout_stock_rejections_total': ('counter', 'Checkouts rejected for insufficient stock'),
+    'mart_emails_sent_total': ('counter', 'Emails handed to the mail server'),
+    'mart_emails_failed_total': ('counter', 'Email deliveries that raised an error'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series, labels)
+)
+"""
+
+
+def _labels(labels):
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in sorted(labels.items())
+    )
+    return ','.join(f'{key}="{value}"' for key, value in escaped)
+
+
+class MetricsStore:
+    """
+    Counters shared by every worker process through one SQLite file.
+
+    Each process adds up its increments in memory and folds them into the
+    file at most every METRICS_FLUSH_INTERVAL seconds, so recording a sample
+    never waits on another process. Histograms are kept as cumulative
+    ``_bucket`` series plus ``_sum`` and ``_count``, all plain counters.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = defaultdict(float)
+        self.last_flush = time.monotonic()
+        self.pid = None
+        self.db = None
+
+    def connect(self):
+        # A forked worker must not share its parent's connection.
+        if self.db is None or self.pid != os.getpid():
+            self.db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('PRAGMA synchronous=NORMAL')
+            self.db.execute(SCHEMA)
+            self.pid = os.getpid()
+        return self.db
+
+    def add(self, series, labels, value):
+        with self.lock:
+            self.pending[series, labels] += value
+            due = time.monotonic() - self.last_flush >= METRICS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(float)
+            self.last_flush = time.monotonic()
+            if not pending:
+                return
+            try:
+                db = self.connect()
+                db.execute('BEGIN IMMEDIATE')
+                db.executemany(
+                    'INSERT INTO samples (series, labels, value) VALUES (?, ?, ?) '
+                    'ON CONFLICT (series, labels) DO UPDATE SET value = value + excluded.value',
+                    [(series, labels, value) for (series, labels), value in pending.items()],
+                )
+                db.execute('COMMIT')
+            except sqlite3.Error:
+                logger.exception('Could not write metrics to %s', self.path)
+                if self.db is not None and self.db.in_transaction:
+                    self.db.execute('ROLLBACK')
+                # Keep the samples for the next attempt.
+                for key, value in pending.items():
+                    self.pending[key] += value
+
+    def samples(self):
+        self.flush()
+        with self.lock:
+            return self.connect().execute('SELECT series, labels, value FROM samples ORDER BY series, labels').fetchall()
+
+
+store = MetricsStore(METRICS_DB_PATH)
+atexit.register(store.flush)
+
+
+def inc(name, value=1, **labels):
+    if METRICS_ENABLED:
+        store.add(name, _labels(labels), value)
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    if not METRICS_ENABLED:
+        return
+    for bound in buckets:
+        if value <= bound:
+            store.add(f'{name}_bucket', _labels({**labels, 'le': bound}), 1)
+    store.add(f'{name}_bucket', _labels({**labels, 'le': '+Inf'}), 1)
+    store.add(f'{name}_sum', _labels(labels), value)
+    store.add(f'{name}_count', _labels(labels), 1)
+
+
+LE_LABEL = re.compile(r'le="([^"]*)",?')
+
+
+def _sample_order(sample):
+    """Group each label set's buckets in ascending ``le`` order, then ``_sum`` and ``_count``."""
+    series, labels, _ = sample
+    match = LE_LABEL.search(labels)
+    return LE_LABEL.sub('', labels), series.rsplit('_', 1)[-1] != 'bucket', float(match.group(1)) if match else 0
+
+
+def render():
+    """All samples in the Prometheus text exposition format."""
+    by_metric = defaultdict(list)
+    for series, labels, value in store.samples():
+        for suffix in ('_bucket', '_sum', '_count', ''):
+            if series.endswith(suffix) and series[:len(series) - len(suffix)] in METRICS:
+                by_metric[series[:len(series) - len(suffix)]].append((series, labels, value))
+                break
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for series, labels, value in sorted(by_metric[name], key=_sample_order):
+            value = int(value) if value.is_integer() else value
+            lines.append(f'{series}{{{labels}}} {value}' if labels else f'{series} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    if not METRICS_ENABLED:
+        raise Http404
+    # Without a token there is nothing to check a scraper against, so the
+    # endpoint stays closed rather than open to everyone.
+    if not METRICS_TOKEN or not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class MetricsMiddleware:
+    """Count and time every request, labelled by the URL name it resolved to."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        if not METRICS_TOKEN:
+            logger.warning('METRICS_ENABLED is set but METRICS_TOKEN is not; /metrics refuses every scrape')
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        # Recording only touches the metrics file once per flush interval, so it stays on the event loop.
+        self.record(request, response, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match and match.url_name else 'unmatched'
+        inc('mart_http_requests_total', view=view, method=request.method, status=response.status_code)
+        if response.status_code >= 500:
+            inc('mart_http_errors_total', view=view, method=request.method)
+        observe('mart_http_request_duration_seconds', elapsed, view=view, method=request.method)
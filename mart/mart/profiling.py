@@ -0,0 +1,113 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = getattr(settings, 'PROFILING_ENABLED', False)
+PROFILING_SAMPLE_RATE = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+PROFILING_SLOW_REQUEST_MS = getattr(settings, 'PROFILING_SLOW_REQUEST_MS', 500)
+PROFILING_SLOW_QUERY_MS = getattr(settings, 'PROFILING_SLOW_QUERY_MS', 100)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slow_queries = []
+        self.view_start = None  # (clock, db_time) when the view was called
+        # Set for views that return a template response, as DRF views do.
+        self.view_time = None
+        self.render_time = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook: time every statement of the request.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed * 1000 >= PROFILING_SLOW_QUERY_MS:
+                self.slow_queries.append((elapsed, sql, params))
+
+
+class ProfilingMiddleware:
+    """
+    Time a sample of requests and report the database, view, render and total
+    time in a ``Server-Timing`` header. ``view`` is the view's own code with
+    its queries taken out, which for DRF views is mostly building the
+    serializer data; ``render`` is the renderer turning that into bytes. Both
+    are measured through the middleware's view and template-response hooks,
+    so nothing outside this class is patched. Requests slower than
+    PROFILING_SLOW_REQUEST_MS and statements slower than PROFILING_SLOW_QUERY_MS
+    are logged to ``mart.profiling`` with the view that handled them.
+
+    Off unless PROFILING_ENABLED is set; PROFILING_SAMPLE_RATE controls the
+    fraction of requests profiled. Sync only, so under ASGI it moves every
+    request below it onto a worker thread; leave it off there except to debug.
+    """
+
+    def __init__(self, get_response):
+        if not PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = request._profile = RequestProfile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        timings = [f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"']
+        if profile.view_time is not None:
+            timings.append(f'view;dur={profile.view_time * 1000:.1f}')
+        if profile.render_time is not None:
+            timings.append(f'render;dur={profile.render_time * 1000:.1f}')
+        timings.append(f'total;dur={total * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+        self.log(request, response, profile, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, '_profile', None)
+        if profile is not None:
+            profile.view_start = (time.perf_counter(), profile.db_time)
+
+    def process_template_response(self, request, response):
+        # Runs once the view has returned and before the response is rendered.
+        profile = getattr(request, '_profile', None)
+        if profile is None or profile.view_start is None:
+            return response
+        now = time.perf_counter()
+        started, db_time = profile.view_start
+        profile.view_time = (now - started) - (profile.db_time - db_time)
+
+        def rendered(response):
+            profile.render_time = time.perf_counter() - now
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, profile, total):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '-'
+        for elapsed, sql, params in profile.slow_queries:
+            logger.warning('Slow query (%.1f ms) in %s: %s; params=%r', elapsed * 1000, view, sql, params)
+        if total * 1000 >= PROFILING_SLOW_REQUEST_MS:
+            logger.warning(
+                'Slow request (%.1f ms) %s %s -> %s in %s: %d queries in %.1f ms, view %.1f ms, render %.1f ms',
+                total * 1000, request.method, request.path, response.status_code, view,
+                profile.queries, profile.db_time * 1000,
+                (profile.view_time or 0) * 1000, (profile.render_time or 0) * 1000,
+            )
@@ -0,0 +1,53 @@
+"""
+JSON rendering and parsing on orjson, the defaults for every DRF view (see
+REST_FRAMEWORK). The output is byte-for-byte what DRF's JSONRenderer
+produces with its default settings: whatever orjson does not encode the
+same way natively (Decimal, datetime, date, time, timedelta, lazy strings,
+querysets) is handed to DRF's own JSONEncoder, so a Decimal is still a JSON
+number, a UTC datetime still ends in ``Z`` and a UUID is its string form.
+"""
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+encode_default = JSONEncoder().default
+
+# U+2028 and U+2029 end a string literal in JavaScript; DRF escapes them too.
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def dumps(data):
+    ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+    for raw, escaped in LINE_SEPARATORS:
+        if raw in ret:
+            ret = ret.replace(raw, escaped)
+    return ret
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent or self.ensure_ascii or not self.compact:
+            # Pretty-printed or non-default output: only the stdlib encoder does it.
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from decouple import config
 from pathlib import Path
 
@@ -54,9 +55,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'mart.metrics.MetricsMiddleware',
+    'mart.profiling.ProfilingMiddleware',
+    'mart.db_routing.ReplicaMiddleware',
+    'mart.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'mart.staticfiles.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,6 +70,21 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request profiling (mart.profiling): Server-Timing header and slow request/query logs
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=1.0, cast=float)  # fraction of requests profiled
+PROFILING_SLOW_REQUEST_MS = 500
+PROFILING_SLOW_QUERY_MS = 100
+
+# Prometheus metrics served at /metrics (mart.metrics), shared by all worker
+# processes through one SQLite file. Off unless METRICS_ENABLED is set, and
+# never on under `manage.py test`; /metrics answers only scrapers that send
+# "Authorization: Bearer <METRICS_TOKEN>", so it is closed while no token is set.
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool) and sys.argv[1:2] != ['test']
+METRICS_DB_PATH = config('METRICS_DB_PATH', default=os.path.join(BASE_DIR, 'metrics.sqlite3'))
+METRICS_FLUSH_INTERVAL = 1  # seconds each process buffers samples before writing them
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 ROOT_URLCONF = 'mart.urls'
 
 TEMPLATES = [
@@ -89,13 +109,94 @@ WSGI_APPLICATION = 'mart.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Tuned for several workers writing at once: WAL lets reads run alongside the
+# single writer, and IMMEDIATE transactions take the write lock at BEGIN, so a
+# checkout queues for up to `timeout` seconds instead of failing with
+# "database is locked" when a read lock cannot be upgraded.
+# `manage.py benchmark_checkout` compares this against the defaults.
+SQLITE_OPTIONS = {
+    'timeout': 20,  # busy_timeout, seconds
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',  # durable across app crashes; fsync only at checkpoints
+        'PRAGMA mmap_size=268435456',  # 256 MiB
+        'PRAGMA cache_size=-20000',  # ~20 MiB per connection
+        'PRAGMA temp_store=MEMORY',
+    ]),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        # A file rather than the in-memory default: the concurrent checkout
+        # tests need separate connections that wait on the write lock.
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    }
+}
+
+# Read replicas for anonymous traffic to the views in REPLICA_URL_NAMES, see
+# mart/db_routing.py. To try it locally, set SQLITE_REPLICA_PATH and keep the
+# copy current with `manage.py sync_sqlite_replica --interval 2`.
+SQLITE_REPLICA_PATH = config('SQLITE_REPLICA_PATH', default='')
+if SQLITE_REPLICA_PATH:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': SQLITE_REPLICA_PATH,
+        'OPTIONS': SQLITE_OPTIONS,
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['mart.db_routing.ReplicaRouter']
+# Views that fill a shared cache stay on the primary. A lagging replica would
+# cache rows from before an edit under the version that edit just bumped,
+# and every client would then see them (see stores.cache). That is why
+# 'public-store-view' is not listed.
+REPLICA_URL_NAMES = [
+    'public-store-products',
+    'recent-stores',
+    'product-search',
+    'track-order',
+    'site-settings',
+]
+# Clients that have just written read from the primary for this long. Keep it
+# above the replica lag (the sync interval).
+REPLICA_STICKY_SECONDS = 15
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Must be shared between worker processes, otherwise storefront invalidation
+# only reaches the worker that handled the write.
+# The file cache culls a random third of its entries once MAX_ENTRIES is
+# reached, so size it for the catalogue: about four entries per store (slug,
+# version, payload per host, visits) plus one per order being tracked.
+CACHE_MAX_ENTRIES = config('CACHE_MAX_ENTRIES', default=20000, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    },
+    # Refresh token blacklist lookups (accounts.tokens): one entry per token
+    # issued, kept for REFRESH_TOKEN_LIFETIME, so size it for a week of logins
+    # and refreshes. Its own alias, so token churn never culls storefronts;
+    # an evicted entry only costs a blacklist table lookup.
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'tokens',
+        'OPTIONS': {'MAX_ENTRIES': config('TOKEN_CACHE_MAX_ENTRIES', default=100000, cast=int)},
+    },
 }
 
+STOREFRONT_CACHE_TIMEOUT = 60 * 15  # seconds
+STOREFRONT_VISIT_FLUSH_EVERY = 25  # storefront hits buffered before writing visit_count
+ORDER_STATUS_CACHE_TIMEOUT = 60  # seconds; status changes and payment proofs invalidate it sooner
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -136,6 +237,49 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 STATIC_URL = 'static/'
 
+# Payment proofs are kept outside MEDIA_ROOT, so the web server cannot hand
+# them out; only the store owner gets them, through orders.views.PaymentProofView
+PRIVATE_MEDIA_ROOT = os.path.join(BASE_DIR, 'private_media')
+
+# Uploaded media is stored once per distinct content, under its SHA-256
+# (mart.storage)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'blobs': {'BACKEND': 'mart.storage.ContentAddressedStorage'},
+    'private': {'BACKEND': 'mart.storage.PrivateStorage'},
+}
+
+# Media responses (mart.media). With MEDIA_SENDFILE set, Django only checks
+# access and the web server sends the bytes: 'x-accel-redirect' for nginx,
+# 'x-sendfile' for Apache mod_xsendfile or lighttpd. Empty streams the file
+# from Django, for local runs.
+MEDIA_SENDFILE = config('MEDIA_SENDFILE', default='')
+# nginx `internal` locations aliasing each media root, for X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT_LOCATIONS = {
+    MEDIA_ROOT: '/_media/',
+    PRIVATE_MEDIA_ROOT: '/_private_media/',
+}
+MEDIA_CACHE_CONTROL = {
+    'blobs': 'public, max-age=31536000, immutable',  # named after their content, never change
+    'variants': 'public, max-age=86400',  # rebuilt under the same name when the widths change
+    'media': 'public, max-age=3600',
+    'payment_proofs': 'private, no-cache',  # revalidated, so access is checked on every use
+}
+
+# Resized copies of product images and store banners (stores.images), queued
+# on upload and built by `manage.py process_image_variants`;
+# `manage.py build_image_variants` backfills existing media
+IMAGE_VARIANT_WIDTHS = {
+    'thumbnail': 160,
+    'card': 480,
+    'full': 1200,
+}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_MAX_ATTEMPTS = 3
+IMAGE_VARIANT_RETRY_DELAY = 60  # seconds, doubled after each failed attempt
+IMAGE_VARIANT_CLAIM_TIMEOUT = 600  # seconds before a batch held by a dead worker is retried
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -165,6 +309,13 @@ EMAIL_HOST_PASSWORD = ''
 DEFAULT_FROM_EMAIL = 'from@eg.com'
 
 
+# Outbox drained by `manage.py process_email_queue`
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 60  # seconds, doubled after each failed attempt
+EMAIL_QUEUE_CLAIM_TIMEOUT = 600  # seconds before a batch held by a dead worker is retried
+EMAIL_CAMPAIGN_CHUNK_SIZE = 500  # vendors per SMTP connection in `manage.py send_email_campaigns`
+
+
 # Email configuration for development (console backend)
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -196,8 +347,41 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # orjson, with the same output as DRF's own JSON classes (mart.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'mart.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'mart.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Per client IP, for views that set a throttle_scope
+    'DEFAULT_THROTTLE_RATES': {
+        'payment_proof_upload': '20/hour',  # starting resumable payment proof uploads
+    },
 }
 
+# Compression of JSON responses (mart.compression): brotli when the Brotli
+# package is installed and the client accepts it, gzip otherwise
+COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies are sent as they are
+COMPRESSION_CONTENT_TYPES = ['application/json']
+COMPRESSION_BROTLI_QUALITY = 4  # 0-11; low qualities keep the CPU cost per response close to gzip's
+
+# Keyset pagination for product and order listings (stores.pagination)
+PAGINATION_PAGE_SIZE = 50
+PAGINATION_MAX_PAGE_SIZE = 200
+
+# Rows upserted per transaction by the product import endpoint (stores.importer)
+PRODUCT_IMPORT_BATCH_SIZE = 500
+
+# Payment proof uploads, single-shot or resumable in chunks (orders.uploads)
+PAYMENT_PROOF_MAX_SIZE = 10 * 1024 * 1024  # bytes
+PAYMENT_PROOF_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/webp', 'application/pdf']
+PAYMENT_PROOF_CHUNK_SIZE = 1024 * 1024  # suggested to clients; any chunk size is accepted
+PAYMENT_PROOF_UPLOAD_EXPIRY = 60 * 60 * 24  # seconds; unfinished uploads older than this are pruned
+
 # Cookie settings
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
@@ -241,6 +425,7 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
     
     'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.CustomTokenRefreshSerializer',
 }
 
 AUTHENTICATION_BACKENDS = [
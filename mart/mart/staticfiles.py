@@ -0,0 +1,40 @@
+from importlib.metadata import version
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+# __acall__ repeats WhiteNoiseMiddleware.__call__ on the attributes it uses
+# (autorefresh, find_file, files, serve), which whitenoise does not document.
+# They are unchanged from 6.7.0, pinned in requirements.txt, through 6.12; on
+# any other major version the middleware falls back to WhiteNoise's own sync
+# behaviour instead of relying on them.
+WHITENOISE_ASYNC_SUPPORTED = version('whitenoise').split('.')[0] == '6'
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that can run in an async middleware stack. The stock middleware
+    is sync-only, which makes Django run every ASGI request below it in a
+    worker thread, async views included.
+    """
+    sync_capable = True
+    async_capable = WHITENOISE_ASYNC_SUPPORTED
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
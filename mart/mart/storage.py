@@ -0,0 +1,137 @@
+"""
+Content-addressed storage for uploaded media. Every file is stored once,
+under the SHA-256 of its bytes, in sharded directories
+(``blobs/ab/cd/<digest>.<ext>``); saving the same bytes again, for another
+product or another store, returns the name that is already there.
+
+A blob's references are the rows whose file fields on this storage hold its
+name (each of those columns is indexed). They are checked when django_cleanup
+deletes a replaced or orphaned upload, after the commit, and the file is only
+removed once no row points at it any more. Since a blob name always means the
+same bytes, mart.media serves them with far-future immutable cache headers.
+
+An upload of bytes that are already stored races that check: delete() can
+find no references just before save() reuses the blob, and remove it before
+the new row commits. save() owns the race. Reusing a blob touches it, and
+delete() leaves alone any blob touched within BLOB_DELETE_GRACE, longer than
+a request takes to commit. A blob that was really released in that window
+stays behind unreferenced until `manage.py prune_orphaned_blobs` removes it.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import models
+from django.utils.functional import cached_property
+
+BLOB_DIR = 'blobs'
+BLOB_DELETE_GRACE = getattr(settings, 'BLOB_DELETE_GRACE', 60 * 10)  # seconds
+
+
+def blob_storage():
+    """Storage of the public media fields; a callable so migrations do not capture the instance."""
+    return storages['blobs']
+
+
+def private_storage():
+    return storages['private']
+
+
+def file_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_fields(storage=None):
+    """``(model, field name)`` for every file field kept in content-addressed storage, or in ``storage``."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+        and (storage is None or field.storage is storage)
+    ]
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, digest, name):
+        ext = os.path.splitext(name)[1].lower()
+        return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = file_digest(content)
+        name = self.blob_name(digest, name)
+        if max_length and len(name) > max_length:
+            name = self.blob_name(digest, '')
+        try:
+            # Marks the blob as just reused, see delete().
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            self._save(name, content)
+        return name
+
+    def _save(self, name, content):
+        # A blob can only ever be overwritten with the same bytes, so two
+        # uploads of one file racing here are harmless: each writes aside and
+        # renames into place.
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), path, allow_overwrite=True)
+        else:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in content.chunks():
+                        f.write(chunk)
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        os.chmod(path, self.file_permissions_mode if self.file_permissions_mode is not None else 0o644)
+        return name
+
+    def is_referenced(self, name):
+        return any(
+            model._default_manager.filter(**{field_name: name}).exists() for model, field_name in blob_fields(self)
+        )
+
+    def recently_saved(self, name):
+        try:
+            return os.path.getmtime(self.path(name)) > time.time() - BLOB_DELETE_GRACE
+        except FileNotFoundError:
+            return False
+
+    def delete(self, name):
+        # Called by django_cleanup after the row has let go of the file; other
+        # rows may still share it. Anything outside BLOB_DIR belongs to one owner.
+        if name and name.startswith(f'{BLOB_DIR}/') and (self.recently_saved(name) or self.is_referenced(name)):
+            return
+        super().delete(name)
+
+
+class PrivateStorage(ContentAddressedStorage):
+    """Content-addressed storage in PRIVATE_MEDIA_ROOT, outside MEDIA_ROOT, for files no public URL may reach."""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'PRIVATE_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
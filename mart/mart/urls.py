@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+from .metrics import metrics_view
+from .media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,7 +10,6 @@ urlpatterns = [
     path('stores/', include('stores.urls')),
     path('orders/', include('orders.urls')),
     path('site-settings/', include('site_settings.urls')),
-]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path('metrics', metrics_view, name='metrics'),
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
+]
\ No newline at end of file
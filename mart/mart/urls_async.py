@@ -0,0 +1,32 @@
+"""
+URLconf for the ASGI application (mart/asgi.py): the routes of mart.urls,
+with the public read endpoints swapped for the async views in
+mart.async_views so they never wait for a worker thread.
+"""
+from django.urls import URLPattern, URLResolver
+from . import async_views, urls
+
+ASYNC_VIEWS = {
+    'public-store-view': async_views.PublicStoreView.as_view(),
+    'recent-stores': async_views.RecentStoresView.as_view(),
+    'site-settings': async_views.SiteSettingsView.as_view(),
+    'track-order': async_views.TrackOrderView.as_view(),
+    'order-status': async_views.OrderStatusView.as_view(),
+}
+
+
+def with_async_views(patterns):
+    swapped = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern, with_async_views(pattern.url_patterns), pattern.default_kwargs,
+                pattern.app_name, pattern.namespace,
+            )
+        elif pattern.name in ASYNC_VIEWS:
+            pattern = URLPattern(pattern.pattern, ASYNC_VIEWS[pattern.name], pattern.default_args, pattern.name)
+        swapped.append(pattern)
+    return swapped
+
+
+urlpatterns = with_async_views(urls.urlpatterns)
@@ -1,6 +1,11 @@
 from django.contrib import admin
+from .analytics import rebuild_order_days
 from .models import Order, OrderItem
 
+# The API views keep the daily sales rollups (orders.analytics) in step as
+# they go. An admin edit can change the status, store, amounts and items in
+# one save, so the days it touches are recomputed from the orders instead.
+
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     extra = 1
@@ -12,8 +17,41 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ('customer_name', 'customer_email', 'store__name')
     inlines = [OrderItemInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        order = form.instance
+        affected = [order]
+        if form.initial.get('store') not in (None, order.store_id):
+            affected.append(Order(store_id=form.initial['store'], created_at=order.created_at))
+        rebuild_order_days(affected)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rebuild_order_days([obj])
+
+    def delete_queryset(self, request, queryset):
+        affected = list(queryset.only('store_id', 'created_at'))
+        super().delete_queryset(request, queryset)
+        rebuild_order_days(affected)
+
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     list_display = ('order', 'product', 'quantity', 'price')
     list_filter = ('order__store', 'order__status')
-    search_fields = ('order__customer_name', 'product__name')
\ No newline at end of file
+    search_fields = ('order__customer_name', 'product__name')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        affected = [obj.order]
+        if form.initial.get('order') not in (None, obj.order_id):
+            affected.append(Order.objects.get(pk=form.initial['order']))
+        rebuild_order_days(affected)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rebuild_order_days([obj.order])
+
+    def delete_queryset(self, request, queryset):
+        affected = list(Order.objects.filter(pk__in=queryset.values('order_id')).only('store_id', 'created_at'))
+        super().delete_queryset(request, queryset)
+        rebuild_order_days(affected)
@@ -0,0 +1,114 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import Order, OrderItem, StoreDailySales, ProductDailySales
+
+
+def is_counted(status):
+    return status not in Order.UNCOUNTED_STATUSES
+
+
+def _increment(model, lookup, deltas, defaults=None):
+    """Add ``deltas`` to the rollup row identified by ``lookup``, creating it if needed."""
+    changes = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas, **(defaults or {}))
+    except IntegrityError:
+        # Another request created the row first.
+        model.objects.filter(**lookup).update(**changes)
+
+
+@transaction.atomic
+def record_order(order, items, sign=1):
+    """Add an order to its day's rollups, or remove it again with ``sign=-1``."""
+    day = timezone.localdate(order.created_at)
+    per_product = defaultdict(lambda: [0, Decimal('0')])
+    for item in items:
+        per_product[item.product_id][0] += item.quantity
+        per_product[item.product_id][1] += item.price * item.quantity
+
+    _increment(StoreDailySales, {'store_id': order.store_id, 'date': day}, {
+        'order_count': sign,
+        'units_sold': sign * sum(units for units, _ in per_product.values()),
+        'revenue': sign * (order.total_amount or 0),
+    })
+    for product_id, (units, revenue) in per_product.items():
+        _increment(ProductDailySales, {'product_id': product_id, 'date': day}, {
+            'order_count': sign,
+            'units_sold': sign * units,
+            'revenue': sign * revenue,
+        }, defaults={'store_id': order.store_id})
+
+
+def record_status_change(order, old_status):
+    """Keep the rollups in step when an order moves in or out of the counted statuses."""
+    was_counted, counted = is_counted(old_status), is_counted(order.status)
+    if was_counted != counted:
+        record_order(order, order.items.all(), 1 if counted else -1)
+
+
+def day_bounds(start, end):
+    """Aware datetimes from the start of ``start`` to the start of the day after ``end``."""
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    )
+
+
+@transaction.atomic
+def rebuild_rollups(start, end, store=None):
+    """Recompute the rollups for the dates ``start`` to ``end`` from the raw orders."""
+    rollup_filter = {'date__range': (start, end)}
+    # Half-open: an order at midnight after ``end`` belongs to the next day,
+    # whose rows are not rebuilt here.
+    lower, upper = day_bounds(start, end)
+    orders = Order.objects.filter(created_at__gte=lower, created_at__lt=upper).exclude(
+        status__in=Order.UNCOUNTED_STATUSES
+    )
+    if store is not None:
+        rollup_filter['store'] = store
+        orders = orders.filter(store=store)
+    StoreDailySales.objects.filter(**rollup_filter).delete()
+    ProductDailySales.objects.filter(**rollup_filter).delete()
+
+    items = OrderItem.objects.filter(order__in=orders).annotate(day=TruncDate('order__created_at'))
+    units = {
+        (row['order__store_id'], row['day']): row['units']
+        for row in items.values('order__store_id', 'day').annotate(units=Sum('quantity'))
+    }
+    store_rows = [
+        StoreDailySales(
+            store_id=row['store_id'], date=row['day'], order_count=row['order_count'],
+            units_sold=units.get((row['store_id'], row['day']), 0), revenue=row['revenue'] or 0,
+        )
+        for row in orders.annotate(day=TruncDate('created_at')).values('store_id', 'day').annotate(
+            order_count=Count('id'), revenue=Sum('total_amount')
+        )
+    ]
+    product_rows = [
+        ProductDailySales(
+            product_id=row['product_id'], store_id=row['order__store_id'], date=row['day'],
+            order_count=row['order_count'], units_sold=row['units'], revenue=row['revenue'],
+        )
+        for row in items.values('product_id', 'order__store_id', 'day').annotate(
+            order_count=Count('order_id', distinct=True),
+            units=Sum('quantity'),
+            revenue=Sum(F('price') * F('quantity'), output_field=DecimalField(max_digits=14, decimal_places=2)),
+        )
+    ]
+    StoreDailySales.objects.bulk_create(store_rows, batch_size=500)
+    ProductDailySales.objects.bulk_create(product_rows, batch_size=500)
+    return len(store_rows), len(product_rows)
+
+
+def rebuild_order_days(orders):
+    """Recompute the rollups of every store and day the given orders fall on."""
+    for store_id, day in {(order.store_id, timezone.localdate(order.created_at)) for order in orders}:
+        rebuild_rollups(day, day, store_id)
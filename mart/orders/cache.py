@@ -0,0 +1,69 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils.http import parse_etags
+from mart.renderers import FastJSONRenderer
+
+ORDER_STATUS_CACHE_TIMEOUT = getattr(settings, 'ORDER_STATUS_CACHE_TIMEOUT', 60)
+
+
+def _generation_key(tracking_number):
+    return f'order-status:generation:{tracking_number}'
+
+
+def _status_key(tracking_number, generation):
+    return f'order-status:{tracking_number}:{generation}'
+
+
+def _generation(tracking_number):
+    key = _generation_key(tracking_number)
+    generation = cache.get(key)
+    if generation is None:
+        # Seeded from the clock, as storefront versions, so an expired
+        # counter never comes back to a generation with a status cached.
+        cache.add(key, time.time_ns(), ORDER_STATUS_CACHE_TIMEOUT * 2)
+        generation = cache.get(key)
+    return generation
+
+
+def get_order_status(tracking_number):
+    """``(etag, data)`` for an order's status summary, or None if there is no such order."""
+    from .models import Order, OrderItem
+    from .serializers import OrderStatusSerializer
+
+    # Read before the order: an invalidation while it loads moves the
+    # generation on, and the summary cached below is never served.
+    key = _status_key(tracking_number, _generation(tracking_number))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    order = (
+        Order.objects
+        .only('tracking_number', 'status', 'payment_proof', 'total_amount', 'created_at', 'updated_at')
+        .prefetch_related(Prefetch(
+            'items', queryset=OrderItem.objects.select_related('product').only('order_id', 'quantity', 'product__name')
+        ))
+        .filter(tracking_number=tracking_number)
+        .first()
+    )
+    if order is None:
+        return None
+    data = OrderStatusSerializer(order).data
+    etag = '"%s"' % hashlib.md5(FastJSONRenderer().render(data)).hexdigest()
+    cache.set(key, (etag, data), ORDER_STATUS_CACHE_TIMEOUT)
+    return etag, data
+
+
+def etag_matches(etag, if_none_match):
+    # If-None-Match compares weakly; compression turns the ETag into W/"...".
+    return etag in {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+
+
+def invalidate_order_status(tracking_number):
+    try:
+        cache.incr(_generation_key(tracking_number))
+    except ValueError:
+        cache.set(_generation_key(tracking_number), time.time_ns(), ORDER_STATUS_CACHE_TIMEOUT * 2)
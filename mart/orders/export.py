@@ -0,0 +1,66 @@
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_CHUNK_SIZE = 500
+
+ORDER_FIELDS = [
+    'id', 'tracking_number', 'created_at', 'status', 'customer_name', 'customer_email',
+    'customer_phone', 'customer_address', 'total_amount',
+]
+ITEM_FIELDS = ['product_id', 'product_name', 'quantity', 'price']
+CSV_HEADER = ['order_id'] + ORDER_FIELDS[1:] + ITEM_FIELDS
+
+# Leading characters that make a spreadsheet read a cell as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() hands back the line for the generator to yield."""
+    def write(self, value):
+        return value
+
+
+def _order_values(order):
+    return [getattr(order, field) for field in ORDER_FIELDS]
+
+
+def _item_values(item):
+    return [item.product_id, item.product.name, item.quantity, item.price]
+
+
+def _csv_safe(values):
+    """
+    Customers and vendors type the names and addresses: quote text that a
+    spreadsheet would otherwise run as a formula (CSV injection).
+    """
+    return [
+        f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+        for value in values
+    ]
+
+
+def stream_csv(orders):
+    """One row per line item, with the order columns repeated. Orders without items get one row."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for order in orders.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        items = order.items.all()
+        if not items:
+            yield writer.writerow(_csv_safe(_order_values(order) + [''] * len(ITEM_FIELDS)))
+        for item in items:
+            yield writer.writerow(_csv_safe(_order_values(order) + _item_values(item)))
+
+
+def stream_ndjson(orders):
+    """One JSON object per order, with its items nested."""
+    for order in orders.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        record = dict(zip(ORDER_FIELDS, _order_values(order)))
+        record['items'] = [dict(zip(ITEM_FIELDS, _item_values(item))) for item in order.items.all()]
+        yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
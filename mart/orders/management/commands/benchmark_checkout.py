@@ -0,0 +1,114 @@
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from stores.models import Store
+
+# The settings before and after the SQLite tuning in mart/settings.py.
+PROFILES = {
+    'default': {},
+    'tuned': settings.SQLITE_OPTIONS,
+}
+
+
+def checkout_worker(args):
+    """Place orders for ``seconds`` from a forked process and report each request's outcome."""
+    path, options, slug, product_ids, seconds, seed = args
+    from rest_framework.test import APIClient
+    from mart import metrics
+
+    # Leave the real metrics alone and keep failed requests out of the console.
+    metrics.METRICS_ENABLED = False
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    conn = connections['default']
+    conn.close()
+    conn.settings_dict.update(NAME=path, OPTIONS=options)
+
+    rng = random.Random(seed)
+    client = APIClient(raise_request_exception=False)
+    url = reverse('order-create', kwargs={'store_slug': slug})
+    latencies, errors = [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        items = [{'product': pk, 'quantity': 1} for pk in rng.sample(product_ids, rng.randint(1, 3))]
+        start = time.perf_counter()
+        response = client.post(url, {
+            'customer_name': 'Benchmark', 'customer_email': 'benchmark@example.com',
+            'customer_phone': '0800', 'customer_address': '1 Benchmark Road', 'items': items,
+        }, format='json')
+        if response.status_code == 201:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors += 1
+    conn.close()
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent checkout throughput on copies of the SQLite database, with and without the tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Processes placing orders at the same time')
+        parser.add_argument('--seconds', type=float, default=10, help='How long each profile runs')
+        parser.add_argument('--store', help='Slug of the store to order from; defaults to the first active store with products')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_checkout only applies to SQLite databases')
+        stores = Store.objects.filter(is_active=True, products__isnull=False)
+        if options['store']:
+            stores = stores.filter(slug=options['store'])
+        store = stores.order_by('pk').first()
+        if store is None:
+            raise CommandError('No active store with products; run seed_marketplace first')
+        product_ids = list(store.products.order_by('pk').values_list('pk', flat=True)[:20])
+        # Lets the workers' test clients through ALLOWED_HOSTS and keeps email in memory.
+        setup_test_environment(debug=False)
+
+        workdir = tempfile.mkdtemp(prefix='benchmark-checkout-')
+        try:
+            results = {name: self.run(name, profile, workdir, store, product_ids, options) for name, profile in PROFILES.items()}
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        default, tuned = results['default']['throughput'], results['tuned']['throughput']
+        if default:
+            self.stdout.write(self.style.SUCCESS(f'Tuned profile: {tuned / default:.1f}x the checkout throughput'))
+
+    def run(self, name, profile, workdir, store, product_ids, options):
+        path = os.path.join(workdir, f'{name}.sqlite3')
+        source = sqlite3.connect(settings.DATABASES['default']['NAME'])
+        target = sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        # Every worker orders from the same products, so give them stock to last the run.
+        target.execute('UPDATE stores_product SET quantity = 1000000 WHERE id IN (%s)' % ','.join('?' * len(product_ids)), product_ids)
+        target.commit()
+        # The journal mode is stored in the file, so undo WAL for the untuned copy.
+        target.execute('PRAGMA journal_mode=DELETE' if not profile else 'PRAGMA journal_mode=WAL')
+        target.close()
+
+        connections.close_all()
+        jobs = [(path, profile, store.slug, product_ids, options['seconds'], seed) for seed in range(options['workers'])]
+        with multiprocessing.get_context('fork').Pool(options['workers']) as pool:
+            outcomes = pool.map(checkout_worker, jobs)
+
+        latencies = sorted(latency for worker_latencies, _ in outcomes for latency in worker_latencies)
+        errors = sum(errors for _, errors in outcomes)
+        throughput = len(latencies) / options['seconds']
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000 if latencies else 0
+        self.stdout.write(
+            f'{name:<8} {len(latencies)} orders ({throughput:.1f}/s), {errors} failed, '
+            f'p50 {statistics.median(latencies) * 1000 if latencies else 0:.1f} ms, p95 {p95:.1f} ms'
+        )
+        return {'throughput': throughput, 'errors': errors}
@@ -0,0 +1,36 @@
+import os
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from mart.storage import private_storage
+from orders.models import PaymentProofUpload
+from orders.uploads import discard_upload
+
+PAYMENT_PROOF_UPLOAD_EXPIRY = getattr(settings, 'PAYMENT_PROOF_UPLOAD_EXPIRY', 60 * 60 * 24)
+
+
+class Command(BaseCommand):
+    help = 'Delete resumable payment proof uploads that have not received a chunk within PAYMENT_PROOF_UPLOAD_EXPIRY'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=PAYMENT_PROOF_UPLOAD_EXPIRY)
+        expired = 0
+        for upload in PaymentProofUpload.objects.filter(updated_at__lt=cutoff).iterator():
+            discard_upload(upload)
+            expired += 1
+
+        # Partial files whose upload row is gone, e.g. after the order was deleted.
+        orphaned = 0
+        storage = private_storage()
+        directory = PaymentProofUpload.PARTIAL_DIR
+        if storage.exists(directory):
+            known = {upload.partial_name for upload in PaymentProofUpload.objects.only('id')}
+            for filename in storage.listdir(directory)[1]:
+                name = f'{directory}/{filename}'
+                if name not in known and os.path.getmtime(storage.path(name)) < time.time() - PAYMENT_PROOF_UPLOAD_EXPIRY:
+                    storage.delete(name)
+                    orphaned += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {expired} expired upload(s) and {orphaned} orphaned partial file(s)'))
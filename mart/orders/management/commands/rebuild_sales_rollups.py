@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from orders.analytics import rebuild_rollups
+from orders.models import Order
+from stores.models import Store
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily store and product sales rollups for a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First day to rebuild (YYYY-MM-DD), defaults to the first order')
+        parser.add_argument('--to', dest='end', help='Last day to rebuild (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--store', help='Only rebuild the store with this slug')
+
+    def handle(self, *args, **options):
+        store = None
+        if options['store']:
+            store = Store.objects.filter(slug=options['store']).first()
+            if store is None:
+                raise CommandError(f'No store with slug "{options["store"]}"')
+
+        end = self.parse(options['end']) if options['end'] else timezone.localdate()
+        if options['start']:
+            start = self.parse(options['start'])
+        else:
+            first = Order.objects.order_by('created_at').values_list('created_at', flat=True).first()
+            start = timezone.localdate(first) if first else end
+
+        store_rows, product_rows = rebuild_rollups(start, end, store)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {store_rows} store and {product_rows} product rollup rows from {start} to {end}'
+        ))
+
+    def parse(self, value):
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'Invalid date "{value}"')
+        return day
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:49
+
+import mart.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_payment_proof_upload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='payment_proof',
+            field=models.FileField(blank=True, null=True, storage=mart.storage.blob_storage, upload_to='payment_proofs/'),
+        ),
+    ]
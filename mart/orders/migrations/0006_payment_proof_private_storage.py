@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:53
+
+import mart.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_media_blob_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='payment_proof',
+            field=models.FileField(blank=True, null=True, storage=mart.storage.private_storage, upload_to='payment_proofs/'),
+        ),
+    ]
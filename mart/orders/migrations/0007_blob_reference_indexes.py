@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_payment_proof_private_storage'),
+        ('stores', '0008_blob_reference_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['payment_proof'], name='order_payment_proof_idx'),
+        ),
+    ]
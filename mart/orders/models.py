@@ -1,10 +1,18 @@
 import uuid
 from django.db import models
+from mart.storage import private_storage
 from stores.models import Store, Product
 
 def generate_tracking_number():
     return str(uuid.uuid4().hex[:10].upper())
 
+class OrderQuerySet(models.QuerySet):
+    def with_items(self):
+        """Load the store and every item with its product in a fixed number of queries."""
+        return self.select_related('store').prefetch_related(
+            models.Prefetch('items', queryset=OrderItem.objects.select_related('product'))
+        )
+
 class Order(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -15,6 +23,8 @@ class Order(models.Model):
         ('delivered', 'Delivered'),
         ('cancelled', 'Cancelled'),
     ]
+    # Orders in these states are left out of the sales rollups.
+    UNCOUNTED_STATUSES = ('cancelled',)
 
     store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='orders')
     customer_name = models.CharField(max_length=100)
@@ -23,14 +33,50 @@ class Order(models.Model):
     customer_address = models.TextField()
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True)
     status = models.CharField(max_length=25, choices=STATUS_CHOICES, default='pending')
-    payment_proof = models.FileField(upload_to='payment_proofs/', null=True, blank=True)
+    payment_proof = models.FileField(upload_to='payment_proofs/', storage=private_storage, null=True, blank=True)
     tracking_number = models.CharField(max_length=10, unique=True, default=generate_tracking_number)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Vendor order list and export: one store's orders in (created_at, id) keyset order.
+            models.Index(fields=['store', 'created_at', 'id'], name='order_store_created_idx'),
+            # The same, narrowed to one status.
+            models.Index(fields=['store', 'status', 'created_at', 'id'], name='order_store_status_idx'),
+            # Status filters across every store (admin), newest first by id.
+            models.Index(fields=['status'], name='order_status_idx'),
+            # Blob reference checks when a payment proof is replaced (mart.storage).
+            models.Index(fields=['payment_proof'], name='order_payment_proof_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.store.name} - {self.status}"
 
+class PaymentProofUpload(models.Model):
+    """A resumable payment proof upload in progress, see orders.uploads."""
+    PARTIAL_DIR = 'payment_proof_uploads'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='payment_proof_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveIntegerField()
+    offset = models.PositiveIntegerField(default=0)
+    replace = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def partial_name(self):
+        """Storage name of the bytes received so far."""
+        return f'{self.PARTIAL_DIR}/{self.pk.hex}.part'
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size}) for order {self.order_id}"
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
@@ -39,3 +85,40 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.quantity} x {self.product.name}"
+
+
+class StoreDailySales(models.Model):
+    """Per-store sales for one day, maintained by orders.analytics."""
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='daily_sales')
+    date = models.DateField()
+    order_count = models.IntegerField(default=0)
+    units_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['store', 'date'], name='unique_store_daily_sales'),
+        ]
+
+    def __str__(self):
+        return f"{self.store.name} - {self.date}"
+
+class ProductDailySales(models.Model):
+    """Per-product sales for one day, maintained by orders.analytics."""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='product_daily_sales')
+    date = models.DateField()
+    order_count = models.IntegerField(default=0)
+    units_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'date'], name='unique_product_daily_sales'),
+        ]
+        indexes = [
+            models.Index(fields=['store', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} - {self.date}"
@@ -1,5 +1,15 @@
+import mimetypes
+from collections import Counter
+from django.db import transaction
+from django.db.models import F
 from rest_framework import serializers
-from .models import Order, OrderItem
+from rest_framework.reverse import reverse
+from mart import metrics
+from stores.cache import bump_storefront_version
+from stores.models import Product
+from .models import Order, OrderItem, PaymentProofUpload
+from .uploads import PAYMENT_PROOF_CONTENT_TYPES, PAYMENT_PROOF_MAX_SIZE
+from .analytics import record_order
 
 class OrderItemSerializer(serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
@@ -7,6 +17,50 @@ class OrderItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = OrderItem
         fields = ['id', 'product', 'product_name', 'quantity', 'price']
+        read_only_fields = ['price']
+
+    def validate_quantity(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Quantity must be at least 1.")
+        return value
+
+class OrderStatusItemSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = OrderItem
+        fields = ['product_name', 'quantity']
+
+class OrderStatusSerializer(serializers.ModelSerializer):
+    """What a customer's tracking page polls for: no customer details, no product records."""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    payment_proof_uploaded = serializers.SerializerMethodField()
+    items = OrderStatusItemSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ['tracking_number', 'status', 'status_display', 'payment_proof_uploaded', 'total_amount', 'created_at', 'updated_at', 'items']
+
+    def get_payment_proof_uploaded(self, obj):
+        return bool(obj.payment_proof)
+
+class PaymentProofUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PaymentProofUpload
+        fields = ['id', 'filename', 'content_type', 'size', 'offset', 'replace']
+        read_only_fields = ['offset']
+
+    def validate_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError("The file is empty.")
+        if value > PAYMENT_PROOF_MAX_SIZE:
+            raise serializers.ValidationError(f"Payment proofs are limited to {PAYMENT_PROOF_MAX_SIZE} bytes.")
+        return value
+
+    def validate_content_type(self, value):
+        if value not in PAYMENT_PROOF_CONTENT_TYPES:
+            raise serializers.ValidationError(f"Must be one of: {', '.join(PAYMENT_PROOF_CONTENT_TYPES)}.")
+        return value
 
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
@@ -17,6 +71,16 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ['id', 'store', 'customer_name', 'customer_email', 'customer_phone', 'customer_address', 'total_amount', 'status', 'payment_proof', 'tracking_number', 'created_at', 'items']
         read_only_fields = ['store', 'total_amount', 'status', 'tracking_number']
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Proofs have no public URL; only the store owner can fetch them, with
+        # a token, so clients need the type to display the download.
+        data['payment_proof_content_type'] = None
+        if data.get('payment_proof'):
+            data['payment_proof'] = reverse('order-payment-proof', kwargs={'pk': instance.pk}, request=self.context.get('request'))
+            data['payment_proof_content_type'] = mimetypes.guess_type(instance.payment_proof.name)[0]
+        return data
+
     def update(self, instance, validated_data):
         payment_proof = validated_data.get('payment_proof')
         if payment_proof:
@@ -24,14 +88,45 @@ class OrderSerializer(serializers.ModelSerializer):
             instance.save()
         return instance
 
+    @transaction.atomic
     def create(self, validated_data):
         items_data = validated_data.pop('items')
-        order = Order.objects.create(**validated_data)
-        total_amount = sum(item_data['price'] * item_data['quantity'] for item_data in items_data)
-        order.total_amount = total_amount
-        order.save()
+        store = validated_data['store']
+
+        wanted = Counter()
+        for item_data in items_data:
+            wanted[item_data['product'].pk] += item_data['quantity']
+
+        # Conditional decrements in a fixed order: a line that would take the
+        # stock below zero updates no row and aborts the whole order. Writing
+        # first also takes SQLite's write lock before anything is read.
+        for product_id in sorted(wanted):
+            updated = Product.objects.filter(
+                pk=product_id, store=store, quantity__gte=wanted[product_id]
+            ).update(quantity=F('quantity') - wanted[product_id])
+            if not updated:
+                product = Product.objects.filter(pk=product_id, store=store).first()
+                if product is None:
+                    raise serializers.ValidationError({'items': "All products must belong to this store."})
+                metrics.inc('mart_checkout_stock_rejections_total')
+                raise serializers.ValidationError({'items': f"Not enough stock for {product.name}."})
 
+        # Prices come from the rows just locked, never from the client.
+        products = Product.objects.in_bulk(wanted)
+        items = []
         for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
+            product = products[item_data['product'].pk]
+            items.append(OrderItem(product=product, quantity=item_data['quantity'], price=product.price))
+        order = Order.objects.create(
+            total_amount=sum(item.price * item.quantity for item in items),
+            **validated_data
+        )
+        for item in items:
+            item.order = order
+        OrderItem.objects.bulk_create(items)
+        record_order(order, items)
 
-        return order
\ No newline at end of file
+        # Stock changed through update(), which does not fire model signals.
+        transaction.on_commit(lambda: bump_storefront_version(store.pk))
+        transaction.on_commit(lambda: metrics.inc('mart_orders_created_total'))
+        return order
@@ -1,3 +1,183 @@
-from django.test import TestCase
+import threading
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from accounts.serializers import CustomTokenObtainPairSerializer
+from stores.models import Product, Store
+from .models import Order, OrderItem, PaymentProofUpload
+from .serializers import OrderSerializer
+from .uploads import discard_upload
 
-# Create your tests here.
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias} for alias in ('default', 'tokens')
+}
+
+
+def create_vendor(name='vendor'):
+    user = get_user_model().objects.create_user(
+        username=name, email=f'{name}@example.com', password='password', is_email_verified=True,
+    )
+    store = Store.objects.create(
+        owner=user, name=f'{name} store', location='Lagos', contact_email=f'{name}@example.com',
+        contact_phone='08000000000', is_active=True,
+    )
+    return user, store
+
+
+def create_products(store, count, quantity=1000):
+    return [
+        Product.objects.create(store=store, name=f'Product {i}', description='-', price=Decimal('10.00'), quantity=quantity)
+        for i in range(count)
+    ]
+
+
+def create_orders(store, products, count, items_per_order=3):
+    orders = Order.objects.bulk_create(
+        Order(
+            store=store, customer_name=f'Customer {i}', customer_email='customer@example.com',
+            customer_phone='08000000000', customer_address='Somewhere', total_amount=Decimal('30.00'),
+            tracking_number=f'T{store.pk:03d}{i:06d}',
+        )
+        for i in range(count)
+    )
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, product=products[(order.pk + n) % len(products)], quantity=1, price=Decimal('10.00'))
+        for order in orders
+        for n in range(items_per_order)
+    )
+    return orders
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OrderQueryBudgetTests(TestCase):
+    """
+    The order endpoints run a fixed number of queries however many orders,
+    items and products are involved: the store is joined in and every item
+    comes with its product in one prefetch (Order.objects.with_items()).
+    """
+    SIZES = ((2, 1), (40, 5))  # (orders, items per order)
+
+    def setUp(self):
+        self.user, self.store = create_vendor()
+        self.products = create_products(self.store, 10)
+        self.client = APIClient()
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def assertBudget(self, queries, request):
+        """``request(order)`` stays within ``queries`` at every dataset size."""
+        for count, items_per_order in self.SIZES:
+            Order.objects.all().delete()
+            orders = create_orders(self.store, self.products, count, items_per_order)
+            with self.subTest(orders=count, items_per_order=items_per_order):
+                with self.assertNumQueries(queries):
+                    response = request(orders[-1])
+                self.assertEqual(response.status_code, 200)
+
+    def test_order_list(self):
+        self.assertBudget(2, lambda order: self.client.get(reverse('order-list'), {'page_size': 200}))
+
+    def test_order_detail(self):
+        self.assertBudget(2, lambda order: self.client.get(reverse('order-detail', kwargs={'pk': order.pk})))
+
+    def test_track_order(self):
+        self.assertBudget(2, lambda order: APIClient().get(
+            reverse('track-order', kwargs={'tracking_number': order.tracking_number})
+        ))
+
+    def test_update_order_status(self):
+        # Between counted statuses, so the sales rollups (one row per product
+        # sold) are left alone: order, items, savepoint, update, release.
+        self.assertBudget(5, lambda order: self.client.put(
+            reverse('update-order-status', kwargs={'pk': order.pk}), {'status': 'processing'}, format='json'
+        ))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PaymentProofUploadTests(TestCase):
+    """An order has one resumable upload at a time, and bad lengths are refused."""
+    client_class = APIClient
+    PROOF = {'filename': 'proof.png', 'size': 1000, 'content_type': 'image/png'}
+
+    def setUp(self):
+        _, store = create_vendor()
+        self.order, = create_orders(store, create_products(store, 1), 1)
+        self.url = reverse('payment-proof-upload-start', kwargs={'tracking_number': self.order.tracking_number})
+
+    def tearDown(self):
+        for upload in PaymentProofUpload.objects.all():
+            discard_upload(upload)
+
+    def test_starting_the_same_file_resumes_it(self):
+        first = self.client.post(self.url, self.PROOF, format='json')
+        again = self.client.post(self.url, self.PROOF, format='json')
+        self.assertEqual((first.status_code, again.status_code), (201, 200))
+        self.assertEqual(again.data['id'], first.data['id'])
+        self.assertEqual(self.order.payment_proof_uploads.count(), 1)
+
+    def test_starting_another_file_replaces_the_upload(self):
+        first = self.client.post(self.url, self.PROOF, format='json')
+        other = self.client.post(self.url, {**self.PROOF, 'size': 2000}, format='json')
+        self.assertEqual(other.status_code, 201)
+        self.assertNotEqual(other.data['id'], first.data['id'])
+        self.assertEqual([str(pk) for pk in self.order.payment_proof_uploads.values_list('pk', flat=True)], [other.data['id']])
+
+    def test_malformed_content_length(self):
+        upload_id = self.client.post(self.url, self.PROOF, format='json').data['id']
+        response = self.client.patch(
+            reverse('payment-proof-upload', kwargs={'tracking_number': self.order.tracking_number, 'upload_id': upload_id}),
+            b'', content_type='application/offset+octet-stream', headers={'Upload-Offset': '0'}, CONTENT_LENGTH='abc',
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """
+    Checkouts racing for the last units: the conditional stock decrements in
+    OrderSerializer.create() let exactly the available stock through.
+    """
+    STOCK = 10
+    CUSTOMERS = 24
+
+    def setUp(self):
+        _, self.store = create_vendor()
+        self.product, = create_products(self.store, 1, quantity=self.STOCK)
+
+    def checkout(self, barrier, results):
+        try:
+            serializer = OrderSerializer(data={
+                'customer_name': 'Customer', 'customer_email': 'customer@example.com',
+                'customer_phone': '08000000000', 'customer_address': 'Somewhere',
+                'items': [{'product': self.product.pk, 'quantity': 1}],
+            })
+            serializer.is_valid(raise_exception=True)
+            barrier.wait()
+            try:
+                serializer.save(store=self.store)
+                results.append('sold')
+            except ValidationError:
+                results.append('rejected')
+        finally:
+            connections.close_all()
+
+    def test_concurrent_checkouts_never_oversell(self):
+        barrier = threading.Barrier(self.CUSTOMERS)
+        results = []
+        threads = [threading.Thread(target=self.checkout, args=(barrier, results)) for _ in range(self.CUSTOMERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), self.CUSTOMERS)
+        self.assertEqual(results.count('sold'), self.STOCK)
+        sold = OrderItem.objects.filter(product=self.product).aggregate(total=Sum('quantity'))['total']
+        self.assertEqual(sold, self.STOCK)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 0)
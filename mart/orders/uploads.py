@@ -0,0 +1,188 @@
+import os
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from mart.storage import private_storage
+from .cache import invalidate_order_status
+from .models import Order, PaymentProofUpload
+
+PAYMENT_PROOF_MAX_SIZE = getattr(settings, 'PAYMENT_PROOF_MAX_SIZE', 10 * 1024 * 1024)
+PAYMENT_PROOF_CONTENT_TYPES = getattr(
+    settings, 'PAYMENT_PROOF_CONTENT_TYPES', ['image/jpeg', 'image/png', 'image/webp', 'application/pdf']
+)
+PAYMENT_PROOF_CHUNK_SIZE = getattr(settings, 'PAYMENT_PROOF_CHUNK_SIZE', 1024 * 1024)
+
+# Request bodies are copied to disk in blocks of this size, never held whole.
+READ_BLOCK_SIZE = 64 * 1024
+# Enough of the file to recognise every allowed type.
+SNIFF_LENGTH = 12
+
+
+class PartialFile(File):
+    """The received bytes, which FileSystemStorage moves into place instead of copying."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST, **extra):
+        super().__init__(message)
+        self.status_code = status_code
+        self.extra = extra
+
+
+def content_length(request):
+    """The request's declared body length; a missing header counts as empty."""
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise UploadError("Invalid Content-Length header")
+    return length
+
+
+def sniff_content_type(head):
+    """The payment proof type the file's first bytes belong to, or None."""
+    if head.startswith(b'%PDF-'):
+        return 'application/pdf'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def check_content(head, content_type=None):
+    """Reject files that are not an allowed type, or not the type the client declared."""
+    detected = sniff_content_type(head)
+    if detected not in PAYMENT_PROOF_CONTENT_TYPES or (content_type and detected != content_type):
+        raise UploadError(
+            f"Payment proof must be one of: {', '.join(PAYMENT_PROOF_CONTENT_TYPES)}",
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+
+def check_payment_proof(upload):
+    """Size and type checks for a payment proof sent in one multipart request."""
+    if upload.size > PAYMENT_PROOF_MAX_SIZE:
+        raise UploadError("Payment proof is too large", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    head = upload.read(SNIFF_LENGTH)
+    upload.seek(0)
+    check_content(head)
+
+
+def start_upload(order, filename, size, content_type, replace=False):
+    """
+    Start a payment proof upload, or resume the one the order already has for
+    the same file. An order has at most one upload in progress: starting a
+    different file abandons the previous one, so restarts cannot pile up
+    partial files. Returns ``(upload, created)``.
+    """
+    if order.payment_proof and not replace:
+        raise UploadError("Payment proof already exists", exists=True)
+    with transaction.atomic():
+        # Starts for the same order queue here, so two cannot both create one.
+        Order.objects.select_for_update().filter(pk=order.pk).exists()
+        for upload in order.payment_proof_uploads.all():
+            if (upload.filename, upload.size, upload.content_type, upload.replace) == (filename, size, content_type, replace):
+                return upload, False
+            discard_upload(upload)
+        upload = PaymentProofUpload.objects.create(
+            order=order, filename=filename, size=size, content_type=content_type, replace=replace
+        )
+    path = private_storage().path(upload.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload, True
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Append ``length`` bytes from ``stream`` at ``offset``, which must be where
+    the upload left off. Whatever arrives is kept even if the client drops
+    mid-chunk, so it can resume from the offset it is told. Returns the upload,
+    or the order once the last byte is in and the proof is attached.
+    """
+    if offset != upload.offset:
+        raise UploadError("Offset does not match the bytes received", status.HTTP_409_CONFLICT, offset=upload.offset)
+    if length > upload.size - offset:
+        raise UploadError("Chunk runs past the declared size", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, offset=offset)
+
+    written = 0
+    try:
+        with open(private_storage().path(upload.partial_name), 'r+b') as part:
+            part.seek(offset)
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written)) if stream else b''
+                if not block:
+                    break
+                if offset == 0 and written == 0:
+                    # Check the type from the first bytes, before any of it reaches the disk.
+                    while len(block) < min(SNIFF_LENGTH, length):
+                        more = stream.read(min(SNIFF_LENGTH, length) - len(block))
+                        if not more:
+                            break
+                        block += more
+                    try:
+                        check_content(block, upload.content_type)
+                    except UploadError:
+                        discard_upload(upload)
+                        raise
+                part.write(block)
+                written += len(block)
+            part.flush()
+            os.fsync(part.fileno())
+    finally:
+        if written:
+            # A retried chunk may race this one; only the write that starts at
+            # the recorded offset moves it forward.
+            if PaymentProofUpload.objects.filter(pk=upload.pk, offset=offset).update(
+                offset=offset + written, updated_at=timezone.now()
+            ):
+                upload.offset = offset + written
+            else:
+                upload.refresh_from_db(fields=['offset'])
+
+    if written < length:
+        raise UploadError("Chunk ended early; resume from the returned offset", offset=upload.offset)
+    if upload.offset == upload.size:
+        return complete_upload(upload)
+    return upload
+
+
+def complete_upload(upload):
+    """Attach the assembled file to the order and end the upload, all or nothing."""
+    order = Order.objects.get(pk=upload.order_id)
+    if order.payment_proof and not upload.replace:
+        discard_upload(upload)
+        raise UploadError("Payment proof already exists", exists=True)
+    partial_name = upload.partial_name
+    stored = None
+    try:
+        with transaction.atomic():
+            with open(private_storage().path(partial_name), 'rb') as part:
+                order.payment_proof.save(upload.filename, PartialFile(part, name=upload.filename), save=False)
+            stored = order.payment_proof.name
+            order.save(update_fields=['payment_proof', 'updated_at'])
+            upload.delete()
+    except Exception:
+        # Leave no file behind that nothing points to.
+        if stored:
+            order.payment_proof.storage.delete(stored)
+        raise
+    # Still there if the same file was already stored and nothing was moved.
+    private_storage().delete(partial_name)
+    invalidate_order_status(order.tracking_number)
+    return order
+
+
+def discard_upload(upload):
+    name = upload.partial_name
+    upload.delete()
+    private_storage().delete(name)
@@ -1,13 +1,18 @@
 from django.urls import path
-from .views import OrderCreateView, OrderListView, OrderDetailView, OrderDeleteView, UpdateProductQuantityView, UpdateOrderStatusView, UploadPaymentProofView, TrackOrderView
+from .views import OrderCreateView, OrderListView, OrderDetailView, OrderDeleteView, UpdateProductQuantityView, UpdateOrderStatusView, PaymentProofView, UploadPaymentProofView, PaymentProofUploadStartView, PaymentProofUploadView, TrackOrderView, OrderStatusView, OrderExportView
 
 urlpatterns = [
     path('create/<slug:store_slug>/', OrderCreateView.as_view(), name='order-create'),
     path('list/', OrderListView.as_view(), name='order-list'),
+    path('export/', OrderExportView.as_view(), name='order-export'),
     path('<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
     path('<int:pk>/delete/', OrderDeleteView.as_view(), name='order-delete'),
     path('update-product-quantity/<int:pk>/', UpdateProductQuantityView.as_view(), name='update-product-quantity'),
+    path('<int:pk>/payment-proof/', PaymentProofView.as_view(), name='order-payment-proof'),
     path('<int:pk>/update-status/', UpdateOrderStatusView.as_view(), name='update-order-status'),
     path('upload-payment-proof/<str:tracking_number>/', UploadPaymentProofView.as_view(), name='upload_payment_proof'),
+    path('upload-payment-proof/<str:tracking_number>/uploads/', PaymentProofUploadStartView.as_view(), name='payment-proof-upload-start'),
+    path('upload-payment-proof/<str:tracking_number>/uploads/<uuid:upload_id>/', PaymentProofUploadView.as_view(), name='payment-proof-upload'),
     path('track/<str:tracking_number>/', TrackOrderView.as_view(), name='track-order'),
+    path('track/<str:tracking_number>/status/', OrderStatusView.as_view(), name='order-status'),
 ]
\ No newline at end of file
@@ -1,18 +1,31 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from .utils import send_order_confirmation_email
+from .export import EXPORT_FORMATS
+from .analytics import is_counted, record_order, record_status_change
+from .cache import etag_matches, get_order_status, invalidate_order_status
+from .uploads import PAYMENT_PROOF_CHUNK_SIZE, PAYMENT_PROOF_MAX_SIZE, READ_BLOCK_SIZE, UploadError, check_payment_proof, content_length, discard_upload, start_upload, write_chunk
 from rest_framework import generics, permissions, status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 from stores.serializers import ProductSerializer
-from .models import Order
-from .serializers import OrderSerializer
+from .models import Order, PaymentProofUpload
+from .serializers import OrderSerializer, OrderStatusSerializer, PaymentProofUploadSerializer
 from stores.models import Product, Store
+from stores.pagination import KeysetPagination
+from accounts.auth import VendorClaimsAuthentication
+from mart.media import send_file
 from rest_framework.parsers import MultiPartParser, FormParser
 
 class IsStoreOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.store.owner == request.user
+        return obj.store.owner_id == request.user.id
 
 class OrderCreateView(generics.CreateAPIView):
     serializer_class = OrderSerializer
@@ -20,8 +33,9 @@ class OrderCreateView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         store = get_object_or_404(Store, slug=self.kwargs['store_slug'])
-        order = serializer.save(store=store)
-        send_order_confirmation_email(order)
+        with transaction.atomic():
+            order = serializer.save(store=store)
+            send_order_confirmation_email(order)
 
 
 class UploadPaymentProofView(APIView):
@@ -41,32 +55,138 @@ class UploadPaymentProofView(APIView):
         if not order:
             return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        # Refuse oversized bodies before the multipart parser spools them to disk.
+        try:
+            length = content_length(request)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+        if length > PAYMENT_PROOF_MAX_SIZE + READ_BLOCK_SIZE:
+            return Response({"error": "Payment proof is too large"}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
         if 'payment_proof' not in request.FILES:
             return Response({"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST)
 
         if order.payment_proof and not update:
             return Response({"error": "Payment proof already exists", "exists": True}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            check_payment_proof(request.FILES['payment_proof'])
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+
         serializer = OrderSerializer(order, data={'payment_proof': request.FILES['payment_proof']}, partial=True)
         if serializer.is_valid():
             serializer.save()
+            invalidate_order_status(order.tracking_number)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class PaymentProofUploadStartView(APIView):
+    """
+    Start a resumable payment proof upload. POST ``filename``, ``size``,
+    ``content_type`` and optionally ``replace``; then PATCH the bytes in order
+    to the returned upload (see PaymentProofUploadView). Starting the same
+    file again returns the upload already under way, to resume from its offset.
+    """
+    throttle_scope = 'payment_proof_upload'
+    throttle_classes = [ScopedRateThrottle]
+
+    def post(self, request, tracking_number):
+        order = Order.objects.filter(tracking_number=tracking_number).first()
+        if not order:
+            return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
+        serializer = PaymentProofUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload, created = start_upload(order, **serializer.validated_data)
+        except UploadError as e:
+            return Response({"error": str(e), **e.extra}, status=e.status_code)
+        data = PaymentProofUploadSerializer(upload).data
+        data['chunk_size'] = PAYMENT_PROOF_CHUNK_SIZE
+        return Response(data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class PaymentProofUploadView(APIView):
+    """
+    One resumable payment proof upload.
+
+    GET reports how many bytes have arrived. PATCH sends the next chunk as the
+    raw request body with an ``Upload-Offset`` header equal to that count; it
+    is written straight to disk, and a chunk cut short still counts up to its
+    last byte received. The chunk that completes the file attaches it to the
+    order. DELETE abandons the upload.
+    """
+    # The body is read from request.stream, never parsed.
+    parser_classes = ()
+
+    def get_upload(self, tracking_number, upload_id):
+        return PaymentProofUpload.objects.filter(pk=upload_id, order__tracking_number=tracking_number).first()
+
+    def get(self, request, tracking_number, upload_id):
+        upload = self.get_upload(tracking_number, upload_id)
+        if not upload:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(PaymentProofUploadSerializer(upload).data, headers={'Upload-Offset': upload.offset})
+
+    def patch(self, request, tracking_number, upload_id):
+        upload = self.get_upload(tracking_number, upload_id)
+        if not upload:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = write_chunk(upload, offset, request.stream, content_length(request))
+        except UploadError as e:
+            return Response({"error": str(e), **e.extra}, status=e.status_code)
+        if isinstance(result, Order):
+            return Response({"complete": True, "order": OrderStatusSerializer(result).data})
+        return Response({"complete": False, **PaymentProofUploadSerializer(result).data}, headers={'Upload-Offset': result.offset})
+
+    def delete(self, request, tracking_number, upload_id):
+        upload = self.get_upload(tracking_number, upload_id)
+        if not upload:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        discard_upload(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class TrackOrderView(generics.RetrieveAPIView):
     serializer_class = OrderSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = Order.objects.all()
+    queryset = Order.objects.with_items()
     lookup_field = 'tracking_number'
 
 
+class OrderStatusView(APIView):
+    """
+    Compact, cached status of an order for tracking pages that poll. Send the
+    last ``ETag`` back in ``If-None-Match`` to get a 304 while nothing changed.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, tracking_number):
+        cached = get_order_status(tracking_number)
+        if cached is None:
+            return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
+        etag, data = cached
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag_matches(etag, request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
+
+
 class UpdateProductQuantityView(generics.UpdateAPIView):
     serializer_class = ProductSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
 
     def get_queryset(self):
-        return Product.objects.filter(store__owner=self.request.user)
+        return Product.objects.filter(store__owner_id=self.request.user.id)
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -81,25 +201,28 @@ class UpdateProductQuantityView(generics.UpdateAPIView):
 
 class OrderListView(generics.ListAPIView):
     serializer_class = OrderSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        store = Store.objects.get(owner=self.request.user)
-        return Order.objects.filter(store=store)
+        return Order.objects.with_items().filter(store__owner_id=self.request.user.id)
 
 class OrderDetailView(generics.RetrieveAPIView):
     serializer_class = OrderSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
-    queryset = Order.objects.all()
+    queryset = Order.objects.with_items()
 
     def get_object(self):
         obj = super().get_object()
-        if obj.store.owner != self.request.user:
+        if obj.store.owner_id != self.request.user.id:
             raise PermissionDenied("You do not have permission to view this order.")
         return obj
     
 class OrderDeleteView(generics.DestroyAPIView):
     serializer_class = OrderSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
     queryset = Order.objects.all()
 
@@ -107,17 +230,81 @@ class OrderDeleteView(generics.DestroyAPIView):
         instance = self.get_object()
         self.perform_destroy(instance)
         return Response({"message": "Order deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        if is_counted(instance.status):
+            record_order(instance, instance.items.all(), -1)
+        instance.delete()
+        transaction.on_commit(lambda: invalidate_order_status(instance.tracking_number))
     
+class PaymentProofView(APIView):
+    """The order's payment proof, for the owner of the store only."""
+    authentication_classes = [VendorClaimsAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
+
+    def get(self, request, pk):
+        order = get_object_or_404(Order.objects.select_related('store').only('payment_proof', 'store__owner_id'), pk=pk)
+        self.check_object_permissions(request, order)
+        if not order.payment_proof:
+            return Response({"error": "No payment proof uploaded"}, status=status.HTTP_404_NOT_FOUND)
+        return send_file(request, order.payment_proof.storage, order.payment_proof.name, 'payment_proofs')
+
 class UpdateOrderStatusView(APIView):
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [permissions.IsAuthenticated, IsStoreOwner]
 
     def put(self, request, pk):
-        order = get_object_or_404(Order, pk=pk)
+        order = get_object_or_404(Order.objects.with_items(), pk=pk)
         self.check_object_permissions(request, order)
         new_status = request.data.get('status')
         if new_status not in dict(Order.STATUS_CHOICES):
             return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
+        old_status = order.status
         order.status = new_status
-        order.save()
+        with transaction.atomic():
+            order.save()
+            record_status_change(order, old_status)
+            transaction.on_commit(lambda: invalidate_order_status(order.tracking_number))
         serializer = OrderSerializer(order)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+class OrderExportView(APIView):
+    """
+    Stream the vendor's orders as CSV or NDJSON (``?type=csv|ndjson``), optionally
+    filtered by ``from``/``to`` dates (inclusive, YYYY-MM-DD) and ``status``.
+    """
+    authentication_classes = [VendorClaimsAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in EXPORT_FORMATS:
+            return Response({"error": "Invalid export type"}, status=status.HTTP_400_BAD_REQUEST)
+
+        orders = Order.objects.with_items().filter(store__owner_id=request.user.id).order_by('created_at', 'id')
+
+        for param, lookup, offset in (('from', 'created_at__gte', 0), ('to', 'created_at__lt', 1)):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                return Response({"error": f"Invalid '{param}' date"}, status=status.HTTP_400_BAD_REQUEST)
+            # Compare against day boundaries rather than created_at__date so the index on created_at is usable.
+            boundary = timezone.make_aware(datetime.combine(day + timedelta(days=offset), time.min))
+            orders = orders.filter(**{lookup: boundary})
+
+        order_status = request.query_params.get('status')
+        if order_status:
+            if order_status not in dict(Order.STATUS_CHOICES):
+                return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
+            orders = orders.filter(status=order_status)
+
+        stream, content_type = EXPORT_FORMATS[export_type]
+        response = StreamingHttpResponse(stream(orders), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="orders.{export_type}"'
+        return response
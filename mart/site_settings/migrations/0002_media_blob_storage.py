@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:49
+
+import mart.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sitesettings',
+            name='logo',
+            field=models.FileField(blank=True, storage=mart.storage.blob_storage, upload_to='logos/'),
+        ),
+    ]
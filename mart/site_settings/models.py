@@ -2,6 +2,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 # from stores.models import Store
 from django.conf import settings
+from mart.storage import blob_storage
 
 class SingletonModel(models.Model):
     class Meta:
@@ -14,7 +15,7 @@ class SingletonModel(models.Model):
 
 class SiteSettings(SingletonModel):
     site_name = models.CharField(max_length=100)
-    logo = models.FileField(upload_to='logos/', blank=True)
+    logo = models.FileField(upload_to='logos/', storage=blob_storage, blank=True)
     tagline = models.CharField(max_length=200, blank=True)
     contact_email = models.EmailField()
     contact_phone = models.CharField(max_length=20)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Store, BankDetails, Product
+from .models import Store, BankDetails, Product, ImageVariantJob
 
 class BankDetailsInline(admin.TabularInline):
     model = BankDetails
@@ -25,4 +25,9 @@ class BankDetailsAdmin(admin.ModelAdmin):
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'store', 'price', 'quantity')
     list_filter = ('store',)
-    search_fields = ('name', 'store__name', 'description')
\ No newline at end of file
+    search_fields = ('name', 'store__name', 'description')
+@admin.register(ImageVariantJob)
+class ImageVariantJobAdmin(admin.ModelAdmin):
+    list_display = ('model', 'object_id', 'field_name', 'status', 'attempts', 'next_attempt_at')
+    list_filter = ('status', 'model')
+    readonly_fields = ('claim_token', 'claimed_at', 'created_at', 'last_error')
@@ -0,0 +1,82 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+STOREFRONT_CACHE_TIMEOUT = getattr(settings, 'STOREFRONT_CACHE_TIMEOUT', 60 * 15)
+STOREFRONT_VISIT_FLUSH_EVERY = getattr(settings, 'STOREFRONT_VISIT_FLUSH_EVERY', 25)
+
+
+def _slug_key(slug):
+    return f'storefront:slug:{slug}'
+
+
+def _version_key(store_id):
+    return f'storefront:version:{store_id}'
+
+
+def _visits_key(store_id):
+    return f'storefront:visits:{store_id}'
+
+
+def _payload_key(store_id, version, slug, base_url):
+    # Absolute media URLs depend on the requesting host, so it is part of the key.
+    digest = hashlib.md5(f'{slug}|{base_url}'.encode()).hexdigest()
+    return f'storefront:payload:{store_id}:{version}:{digest}'
+
+
+def get_storefront_version(store_id):
+    key = _version_key(store_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock rather than 1 so an evicted counter never
+        # reuses a version that still has a payload cached under it.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_storefront_version(store_id):
+    try:
+        cache.incr(_version_key(store_id))
+    except ValueError:
+        cache.set(_version_key(store_id), time.time_ns(), None)
+
+
+def get_cached_storefront(slug, base_url):
+    """
+    ``(store id, version, payload)`` for a storefront. On a miss the payload
+    is None, and so are the id and version if the slug is not cached.
+    """
+    store_id = cache.get(_slug_key(slug))
+    if store_id is None:
+        return None, None, None
+    version = get_storefront_version(store_id)
+    return store_id, version, cache.get(_payload_key(store_id, version, slug, base_url))
+
+
+def set_cached_storefront(store, version, base_url, data):
+    """
+    Cache a storefront payload under the version read *before* it was loaded
+    from the database. An edit committed in between has bumped the version
+    past it, so the payload is never served.
+    """
+    cache.set(_slug_key(store.slug), store.pk, STOREFRONT_CACHE_TIMEOUT)
+    cache.set(_payload_key(store.pk, version, store.slug, base_url), data, STOREFRONT_CACHE_TIMEOUT)
+
+
+def record_storefront_visit(store_id):
+    """Count a storefront hit, flushing to the database in batches."""
+    from .models import Store
+
+    key = _visits_key(store_id)
+    try:
+        visits = cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        visits = cache.incr(key)
+    if visits >= STOREFRONT_VISIT_FLUSH_EVERY:
+        cache.decr(key, visits)
+        Store.objects.filter(pk=store_id).update(visit_count=F('visit_count') + visits)
@@ -0,0 +1,183 @@
+import os
+from datetime import timedelta
+from io import BytesIO
+from uuid import uuid4
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .cache import bump_storefront_version
+from .models import ImageVariantJob
+
+IMAGE_VARIANT_WIDTHS = getattr(settings, 'IMAGE_VARIANT_WIDTHS', {
+    'thumbnail': 160,
+    'card': 480,
+    'full': 1200,
+})
+IMAGE_VARIANT_QUALITY = getattr(settings, 'IMAGE_VARIANT_QUALITY', 80)
+IMAGE_VARIANT_MAX_ATTEMPTS = getattr(settings, 'IMAGE_VARIANT_MAX_ATTEMPTS', 3)
+IMAGE_VARIANT_RETRY_DELAY = getattr(settings, 'IMAGE_VARIANT_RETRY_DELAY', 60)
+IMAGE_VARIANT_CLAIM_TIMEOUT = getattr(settings, 'IMAGE_VARIANT_CLAIM_TIMEOUT', 600)
+
+FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+
+def pending_variants(field_name):
+    """
+    Filter for rows whose variants do not match the current image: new or
+    replaced uploads, and cleared images that still have variants on disk.
+    """
+    variants = f'{field_name}_variants'
+    has_image = Q(**{f'{field_name}__isnull': False}) & ~Q(**{field_name: ''})
+    current = Q(**{f'{variants}__source': F(field_name)})
+    has_variants = Q(**{f'{variants}__source__isnull': False})
+    return (has_image & (~has_variants | ~current)) | (~has_image & has_variants)
+
+
+def needs_variants(instance, field_name):
+    """:func:`pending_variants` for a row that is already loaded."""
+    source = getattr(instance, f'{field_name}_variants').get('source')
+    return (getattr(instance, field_name).name or None) != source
+
+
+def queue_variants(instance, field_name):
+    """
+    Ask the process_image_variants worker to rebuild the variants of one row.
+    Call it in the transaction that saves the image, so the job is committed
+    with it.
+    """
+    return ImageVariantJob.objects.create(
+        model=instance._meta.label_lower, object_id=instance.pk, field_name=field_name,
+    )
+
+
+def _due_jobs(now):
+    # Pending jobs that are due, plus jobs whose worker died mid-batch.
+    return (
+        Q(status='pending', next_attempt_at__lte=now)
+        | Q(status='running', claimed_at__lt=now - timedelta(seconds=IMAGE_VARIANT_CLAIM_TIMEOUT))
+    )
+
+
+def claim_variant_jobs(batch_size):
+    """Claim up to ``batch_size`` due jobs for this worker, the same way claim_emails() does."""
+    now = timezone.now()
+    candidates = list(
+        ImageVariantJob.objects.filter(_due_jobs(now))
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+    token = uuid4().hex
+    ImageVariantJob.objects.filter(_due_jobs(now), pk__in=candidates).update(
+        status='running', claim_token=token, claimed_at=now
+    )
+    return list(ImageVariantJob.objects.filter(claim_token=token, status='running'))
+
+
+def run_variant_jobs(jobs):
+    """
+    Build the variants each claimed job asks for, unless the row no longer
+    needs them (a later job got there first, or the row is gone). Finished
+    jobs are deleted; failed ones are retried with backoff.
+    """
+    built = failed = 0
+    for job in jobs:
+        model = apps.get_model(job.model)
+        instance = model.objects.filter(pending_variants(job.field_name), pk=job.object_id).first()
+        try:
+            if instance is not None:
+                refresh_variants(instance, job.field_name)
+        except (OSError, ValueError) as e:
+            failed += 1
+            job.attempts += 1
+            job.last_error = str(e)
+            if job.attempts >= IMAGE_VARIANT_MAX_ATTEMPTS:
+                job.status = 'failed'
+            else:
+                job.status = 'pending'
+                job.next_attempt_at = timezone.now() + timedelta(
+                    seconds=IMAGE_VARIANT_RETRY_DELAY * 2 ** (job.attempts - 1)
+                )
+            job.claim_token = ''
+            job.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'claim_token'])
+            continue
+        if instance is not None:
+            bump_storefront_version(getattr(instance, 'store_id', instance.pk))
+            built += 1
+        job.delete()
+    return built, failed
+
+
+def variant_name(source_name, label, ext):
+    """Variants are named after their source, so they can be found again once it is deleted."""
+    return f'variants/{os.path.splitext(source_name)[0]}_{label}.{ext}'
+
+
+def build_variants(image_file):
+    """
+    Write a resized WebP and JPEG copy of ``image_file`` for every width in
+    IMAGE_VARIANT_WIDTHS and return the map stored in ``*_variants``.
+    Images are never upscaled.
+    """
+    with image_file.open('rb') as f:
+        original = ImageOps.exif_transpose(Image.open(f))
+        original.load()
+
+    variants = {'source': image_file.name}
+    for label, width in IMAGE_VARIANT_WIDTHS.items():
+        image = original.copy()
+        if image.width > width:
+            image.thumbnail((width, round(image.height * width / image.width)), Image.Resampling.LANCZOS)
+        variant = {'width': image.width}
+        for ext, fmt in FORMATS.items():
+            out = image.convert('RGB') if fmt == 'JPEG' and image.mode != 'RGB' else image
+            buffer = BytesIO()
+            out.save(buffer, fmt, quality=IMAGE_VARIANT_QUALITY, optimize=fmt == 'JPEG')
+            name = variant_name(image_file.name, label, ext)
+            default_storage.delete(name)
+            variant[ext] = default_storage.save(name, ContentFile(buffer.getvalue()))
+        variants[label] = variant
+    return variants
+
+
+def delete_variants(source_name):
+    for label in IMAGE_VARIANT_WIDTHS:
+        for ext in FORMATS:
+            default_storage.delete(variant_name(source_name, label, ext))
+
+
+def refresh_variants(instance, field_name):
+    """
+    Rebuild the variants of one row in place. Files of a replaced image are
+    removed when django_cleanup deletes the image itself (see stores.signals).
+    """
+    image_file = getattr(instance, field_name)
+    variants = build_variants(image_file) if image_file else {}
+    type(instance).objects.filter(pk=instance.pk).update(**{f'{field_name}_variants': variants})
+    return variants
+
+
+def variant_urls(image_file, variants, request=None):
+    """
+    Serializer representation: ``{label: {'width': ..., 'webp': url, 'jpeg': url}}``,
+    ready to be joined into a srcset. Empty until the variants match the image.
+    """
+    if not image_file or variants.get('source') != image_file.name:
+        return {}
+    urls = {}
+    for label in IMAGE_VARIANT_WIDTHS:
+        if label not in variants:
+            continue
+        urls[label] = {'width': variants[label]['width']}
+        for ext in FORMATS:
+            url = default_storage.url(variants[label][ext])
+            urls[label][ext] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from .cache import bump_storefront_version
+from .models import Product
+from .search import index_products
+
+PRODUCT_IMPORT_BATCH_SIZE = getattr(settings, 'PRODUCT_IMPORT_BATCH_SIZE', 500)
+
+IMPORT_FIELDS = ['name', 'description', 'price', 'quantity']
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    sku = serializers.CharField(max_length=64)
+    name = serializers.CharField(max_length=100)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    quantity = serializers.IntegerField(min_value=0)
+
+
+def read_csv(upload):
+    reader = csv.DictReader(io.TextIOWrapper(upload, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(upload):
+    for line_number, line in enumerate(io.TextIOWrapper(upload, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+            continue
+        yield line_number, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+
+
+IMPORT_READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+    'ndjson': read_jsonl,
+}
+
+
+def import_products(store, rows):
+    """
+    Validate ``(line, row)`` pairs as they are read and upsert them by SKU in
+    batches. Each batch is committed on its own, so a bad row only costs
+    its own entry in the returned error report.
+    """
+    report = {'created': 0, 'updated': 0, 'errors': []}
+    batch = {}
+    # One serializer validates every row: building its fields per row would dominate the import.
+    serializer = ProductImportRowSerializer()
+    for line, row in rows:
+        if isinstance(row, Exception):
+            report['errors'].append({'line': line, 'errors': {'non_field_errors': [str(row)]}})
+            continue
+        try:
+            data = serializer.run_validation(row)
+        except serializers.ValidationError as e:
+            report['errors'].append({'line': line, 'errors': e.detail})
+            continue
+        # A SKU repeated within the file is imported with its last values.
+        batch[data['sku']] = data
+        if len(batch) >= PRODUCT_IMPORT_BATCH_SIZE:
+            _save_batch(store, batch, report)
+            batch = {}
+    if batch:
+        _save_batch(store, batch, report)
+
+    # bulk_create()/bulk_update() skip the model signals that normally do this
+    # (the search index is updated per batch above).
+    bump_storefront_version(store.pk)
+    return report
+
+
+@transaction.atomic
+def _save_batch(store, batch, report):
+    existing = {product.sku: product for product in Product.objects.filter(store=store, sku__in=batch)}
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for sku, data in batch.items():
+        product = existing.get(sku)
+        if product is None:
+            to_create.append(Product(store=store, **data))
+            continue
+        for field in IMPORT_FIELDS:
+            setattr(product, field, data[field])
+        product.updated_at = now
+        to_update.append(product)
+
+    Product.objects.bulk_create(to_create, batch_size=PRODUCT_IMPORT_BATCH_SIZE)
+    Product.objects.bulk_update(to_update, IMPORT_FIELDS + ['updated_at'], batch_size=PRODUCT_IMPORT_BATCH_SIZE)
+    index_products(to_create + to_update)
+    report['created'] += len(to_create)
+    report['updated'] += len(to_update)
@@ -0,0 +1,187 @@
+import asyncio
+import math
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from mart.asgi import MartASGIHandler
+from orders.models import Order
+from stores.models import Store
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)] if ordered else 0
+
+
+def wsgi_environ(path):
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'testserver',
+        'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+
+
+def asgi_scope(path):
+    return {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the public read endpoints with many slow clients connected at once: '
+        'sync views on a WSGI thread pool against the async views on one ASGI event loop'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=200, help='Clients connected at the same time')
+        parser.add_argument('--seconds', type=float, default=10, help='How long each path runs')
+        parser.add_argument('--threads', type=int, default=8, help='Worker threads serving the WSGI path')
+        parser.add_argument(
+            '--client-latency', type=float, default=200,
+            help='Milliseconds each client takes to receive a response, as on a slow mobile network'
+        )
+        parser.add_argument('--store', help='Slug of the storefront to request; defaults to the most visited active store')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('benchmark_asgi only applies to SQLite databases')
+        stores = Store.objects.filter(is_active=True)
+        if options['store']:
+            stores = stores.filter(slug=options['store'])
+        store = stores.order_by('-visit_count', 'pk').first()
+        if store is None:
+            raise CommandError('No active store; run seed_marketplace first')
+        paths = [
+            reverse('public-store-view', kwargs={'slug': store.slug}),
+            reverse('recent-stores'),
+            reverse('site-settings'),
+        ]
+        tracking_number = Order.objects.order_by('pk').values_list('tracking_number', flat=True).first()
+        if tracking_number:
+            paths.append(reverse('track-order', kwargs={'tracking_number': tracking_number}))
+
+        # Lets the requests through ALLOWED_HOSTS and keeps the real metrics out of it.
+        setup_test_environment(debug=False)
+        from mart import metrics
+        metrics.METRICS_ENABLED = False
+
+        # Storefront hits write visit counts, so serve both paths from a copy of the database.
+        workdir = tempfile.mkdtemp(prefix='benchmark-asgi-')
+        database = connections.settings['default']
+        original_name = database['NAME']
+        try:
+            path = os.path.join(workdir, 'db.sqlite3')
+            source, target = sqlite3.connect(original_name), sqlite3.connect(path)
+            source.backup(target)
+            source.close()
+            target.close()
+            connections.close_all()
+            database['NAME'] = path
+
+            wsgi = self.report('WSGI', self.run_wsgi(paths, options), options)
+            asgi = self.report('ASGI', asyncio.run(self.run_asgi(paths, options)), options)
+        finally:
+            connections.close_all()
+            database['NAME'] = original_name
+            shutil.rmtree(workdir, ignore_errors=True)
+        if wsgi:
+            self.stdout.write(self.style.SUCCESS(f'ASGI: {asgi / wsgi:.1f}x the WSGI throughput'))
+
+    def run_wsgi(self, paths, options):
+        """One thread per client, queueing for ``--threads`` workers that stay busy until the client has the response."""
+        handler = WSGIHandler()
+        latency = options['client_latency'] / 1000
+        deadline = time.monotonic() + options['seconds']
+        results = []
+
+        def serve(path):
+            status = []
+            response = handler(wsgi_environ(path), lambda s, headers: status.append(s))
+            try:
+                body = b''.join(response)
+            finally:
+                response.close()
+            # A sync worker writes the response itself, so a slow client holds it until the last byte is sent.
+            time.sleep(latency)
+            return status[0].startswith('200') and bool(body)
+
+        def client(n):
+            i = n
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                ok = pool.submit(serve, paths[i % len(paths)]).result()
+                results.append((ok, time.perf_counter() - start))
+                i += 1
+
+        with ThreadPoolExecutor(options['threads']) as pool:
+            clients = [threading.Thread(target=client, args=(n,)) for n in range(options['connections'])]
+            for thread in clients:
+                thread.start()
+            for thread in clients:
+                thread.join()
+        return results
+
+    async def run_asgi(self, paths, options):
+        """Every client as a task on one event loop; a slow client only delays its own ``send``."""
+        application = MartASGIHandler()
+        latency = options['client_latency'] / 1000
+        deadline = time.monotonic() + options['seconds']
+        results = []
+
+        async def request(path):
+            sent = []
+            done = asyncio.Event()
+            body_received = False
+
+            async def receive():
+                nonlocal body_received
+                if not body_received:
+                    body_received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+                if message['type'] == 'http.response.body' and not message.get('more_body'):
+                    await asyncio.sleep(latency)
+                    done.set()
+
+            await application(asgi_scope(path), receive, send)
+            return sent[0]['status'] == 200 and any(message.get('body') for message in sent[1:])
+
+        async def client(n):
+            i = n
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                ok = await request(paths[i % len(paths)])
+                results.append((ok, time.perf_counter() - start))
+                i += 1
+
+        await asyncio.gather(*(client(n) for n in range(options['connections'])))
+        return results
+
+    def report(self, name, results, options):
+        latencies = [elapsed * 1000 for ok, elapsed in results if ok]
+        failed = len(results) - len(latencies)
+        throughput = len(latencies) / options['seconds']
+        self.stdout.write(
+            f'{name}: {len(latencies)} responses ({throughput:.1f}/s), {failed} failed, '
+            f'p50 {percentile(latencies, 0.5):.0f} ms, p95 {percentile(latencies, 0.95):.0f} ms'
+        )
+        return throughput
@@ -0,0 +1,329 @@
+import ipaddress
+import itertools
+import json
+import math
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from importlib import import_module
+from io import BytesIO
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+from accounts.models import EmailVerificationToken
+from accounts.serializers import CustomTokenObtainPairSerializer
+from orders.uploads import start_upload
+from stores.models import Store
+
+User = get_user_model()
+
+URLCONFS = ['accounts.urls', 'stores.urls', 'orders.urls', 'site_settings.urls']
+
+# Latency changes below this many milliseconds are treated as noise.
+NOISE_FLOOR_MS = 1.0
+
+TRANSACTION_SQL = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK')
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def refresh_token(user):
+    return str(CustomTokenObtainPairSerializer.get_token(user))
+
+
+def access_token(user):
+    return str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def png_upload(name='proof.png'):
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), '#336699').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def csv_upload(rows=100):
+    lines = ['sku,name,description,price,quantity']
+    lines += [f'BENCH-{n:04d},Benchmark item {n},Imported by the benchmark,{n % 90 + 9}.99,{n % 40}' for n in range(rows)]
+    return SimpleUploadedFile('products.csv', '\n'.join(lines).encode(), content_type='text/csv')
+
+
+def endpoint_cases(ctx):
+    """
+    ``(url name, method, options)`` for every benchmarked endpoint. ``options``
+    may set ``kwargs`` for reverse(), ``data`` (a callable is re-evaluated for
+    every request), ``format`` or a raw ``content_type``, ``headers``, ``auth``
+    (a key of ``ctx``) and ``refresh_cookie``.
+    """
+    vendor, store, product, order = ctx['vendor'], ctx['store'], ctx['product'], ctx['order']
+    unverified = ctx['unverified']
+    return [
+        # accounts.urls
+        ('register', 'post', {'data': {
+            'first_name': 'Bench', 'last_name': 'Mark', 'username': 'bench-register', 'email': 'register@bench.example.com',
+            'password': 'bench-password', 'accepted_terms': True,
+        }}),
+        ('token_obtain_pair', 'post', {'data': {'email': vendor.email, 'password': ctx['password']}}),
+        ('token_refresh', 'post', {'refresh_cookie': lambda: refresh_token(vendor)}),
+        ('verify-email', 'get', {'kwargs': {'token': ctx['verification_token']}}),
+        ('verify-email-no-slash', 'get', {'kwargs': {'token': ctx['verification_token']}}),
+        ('resend-verification-email', 'post', {'data': {'email': unverified.email}}),
+        ('check-email-verification', 'post', {'data': {'email': unverified.email}}),
+        ('verification-settings', 'get', {}),
+        ('user-profile', 'get', {'auth': 'vendor'}),
+        ('user-profile', 'put', {'auth': 'vendor', 'data': {'first_name': 'Bench'}}),
+        ('logout', 'post', {'auth': 'vendor', 'refresh_cookie': lambda: refresh_token(vendor)}),
+        # stores.urls
+        ('store-create', 'post', {'auth': 'new_vendor', 'data': {
+            'name': 'Benchmark Store', 'location': 'Lagos', 'contact_email': 'store@bench.example.com', 'contact_phone': '0800',
+        }}),
+        ('store-detail', 'get', {'auth': 'vendor'}),
+        ('store-detail', 'patch', {'auth': 'vendor', 'data': {'tag_line': 'Benchmarked'}}),
+        ('bank-details-create', 'post', {'auth': 'vendor', 'data': {
+            'bank_name': 'Bench Bank', 'account_number': '0123456789', 'account_name': 'Bench',
+        }}),
+        ('bank-details-list', 'get', {'auth': 'vendor'}),
+        ('bank-details-detail', 'get', {'auth': 'vendor', 'kwargs': {'pk': ctx['bank_details'].pk}}),
+        ('product-list-create', 'get', {'auth': 'vendor'}),
+        ('product-list-create', 'post', {'auth': 'vendor', 'data': {
+            'name': 'Benchmark product', 'description': 'Created by the benchmark', 'price': '19.99', 'quantity': 10,
+        }}),
+        ('product-import', 'post', {'auth': 'vendor', 'format': 'multipart', 'data': lambda: {'file': csv_upload()}}),
+        ('product-detail', 'get', {'auth': 'vendor', 'kwargs': {'pk': product.pk}}),
+        ('product-detail', 'patch', {'auth': 'vendor', 'kwargs': {'pk': product.pk}, 'data': {'quantity': 99}}),
+        ('recent-stores', 'get', {}),
+        ('product-search', 'get', {'data': {'q': 'leather bag'}}),
+        ('sales-analytics', 'get', {'auth': 'vendor'}),
+        ('public-store-view', 'get', {'kwargs': {'slug': store.slug}}),
+        ('public-store-products', 'get', {'kwargs': {'slug': store.slug}}),
+        # orders.urls
+        ('order-create', 'post', {'kwargs': {'store_slug': store.slug}, 'data': {
+            'customer_name': 'Bench Customer', 'customer_email': 'customer@bench.example.com',
+            'customer_phone': '0800', 'customer_address': '1 Bench Street',
+            'items': [{'product': product.pk, 'quantity': 1}],
+        }}),
+        ('order-list', 'get', {'auth': 'vendor'}),
+        ('order-export', 'get', {'auth': 'vendor', 'data': {'type': 'csv'}}),
+        ('order-detail', 'get', {'auth': 'vendor', 'kwargs': {'pk': order.pk}}),
+        ('order-delete', 'delete', {'auth': 'vendor', 'kwargs': {'pk': order.pk}}),
+        ('update-product-quantity', 'patch', {'auth': 'vendor', 'kwargs': {'pk': product.pk}, 'data': {'quantity': 50}}),
+        ('order-payment-proof', 'get', {'auth': 'vendor', 'kwargs': {'pk': order.pk}}),
+        ('update-order-status', 'put', {'auth': 'vendor', 'kwargs': {'pk': order.pk}, 'data': {'status': 'processing'}}),
+        ('upload_payment_proof', 'put', {
+            'kwargs': {'tracking_number': order.tracking_number}, 'format': 'multipart',
+            'data': lambda: {'payment_proof': png_upload()},
+        }),
+        # Starts the file already under way, which resumes it; a different file
+        # would discard its bytes on disk, which the rollback does not restore.
+        ('payment-proof-upload-start', 'post', {
+            'kwargs': {'tracking_number': order.tracking_number}, 'throttled': True,
+            'data': {'filename': 'proof.png', 'size': ctx['payment_proof_upload'].size, 'content_type': 'image/png', 'replace': True},
+        }),
+        ('payment-proof-upload', 'patch', {
+            'kwargs': {'tracking_number': order.tracking_number, 'upload_id': ctx['payment_proof_upload'].pk},
+            'data': ctx['payment_proof_chunk'], 'content_type': 'application/offset+octet-stream',
+            'headers': {'Upload-Offset': '0'},
+        }),
+        ('track-order', 'get', {'kwargs': {'tracking_number': order.tracking_number}}),
+        ('order-status', 'get', {'kwargs': {'tracking_number': order.tracking_number}}),
+        # site_settings.urls
+        ('site-settings', 'get', {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Time every API endpoint through the test client against the current database '
+        '(see seed_marketplace) and report p50/p95 latency, queries and peak memory'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint before timing')
+        parser.add_argument('--store', help='Slug of the store to benchmark as; defaults to the largest catalogue')
+        parser.add_argument('--password', default='password', help="Password of the store owner (seed_marketplace's default)")
+        parser.add_argument('--only', help='Only run endpoints whose URL name contains this text')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the JSON results')
+        parser.add_argument('--baseline', help='Earlier results to compare against')
+        parser.add_argument('--threshold', type=float, default=20, help='p95 increase, in percent, reported as a regression')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error when anything regressed')
+
+    def handle(self, *args, **options):
+        # Measure with DEBUG off, as in production; it also stops every query being logged.
+        setup_test_environment(debug=False)
+        media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+        try:
+            # Uploads go to a scratch MEDIA_ROOT and every write is rolled back,
+            # so the benchmark leaves the database and media as it found them.
+            with override_settings(MEDIA_ROOT=media_root, PRIVATE_MEDIA_ROOT=os.path.join(media_root, 'private')), transaction.atomic():
+                results = self.run(options)
+                transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(f'Wrote {options["output"]}')
+
+        if options['baseline']:
+            regressions = self.compare(results, options)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{regressions} endpoint(s) regressed')
+
+    def fixtures(self, options):
+        stores = Store.objects.filter(is_active=True).annotate(product_count=Count('products'))
+        if options['store']:
+            stores = stores.filter(slug=options['store'])
+        store = stores.filter(product_count__gt=0).order_by('-product_count').select_related('owner').first()
+        if store is None:
+            raise CommandError('No active store with products to benchmark; run seed_marketplace first')
+        order = store.orders.order_by('-created_at').first()
+        if order is None:
+            raise CommandError(f'Store "{store.slug}" has no orders to benchmark')
+
+        new_vendor = User.objects.create_user(
+            username='bench-new-vendor', email='new-vendor@bench.example.com', password='bench-password',
+            is_vendor=True, is_email_verified=True,
+        )
+        unverified = User.objects.create_user(
+            username='bench-unverified', email='unverified@bench.example.com', password='bench-password',
+        )
+        verification = EmailVerificationToken.objects.create(user=unverified, expires_at=timezone.now() + timedelta(days=1))
+        if not order.payment_proof:
+            order.payment_proof.save('proof.png', png_upload())
+        # The first half of a proof, so the chunk never completes the upload.
+        proof = png_upload().read()
+        payment_proof_upload, _ = start_upload(order, 'proof.png', len(proof), 'image/png', replace=True)
+        return {
+            'password': options['password'],
+            'store': store,
+            'vendor': store.owner,
+            'new_vendor': new_vendor,
+            'unverified': unverified,
+            'verification_token': verification.token,
+            'product': store.products.filter(quantity__gt=0).order_by('pk').first() or store.products.order_by('pk').first(),
+            'order': order,
+            'payment_proof_upload': payment_proof_upload,
+            'payment_proof_chunk': proof[:len(proof) // 2],
+            'bank_details': store.bank_details.first() or store.bank_details.create(
+                bank_name='Bench Bank', account_number='0123456789', account_name='Bench'
+            ),
+        }
+
+    def run(self, options):
+        ctx = self.fixtures(options)
+        cases = endpoint_cases(ctx)
+        self.addresses = (str(ipaddress.IPv4Address('10.0.0.0') + n) for n in itertools.count(1))
+        covered = {name for name, _, _ in cases}
+        for urlconf in URLCONFS:
+            for pattern in import_module(urlconf).urlpatterns:
+                if isinstance(pattern, URLPattern) and pattern.name not in covered:
+                    self.stdout.write(self.style.WARNING(f'No benchmark case for {urlconf}:{pattern.name}'))
+
+        endpoints = {}
+        self.stdout.write(f'{"endpoint":<40} {"status":>6} {"p50 ms":>9} {"p95 ms":>9} {"queries":>8} {"peak KiB":>9}')
+        for name, method, case in cases:
+            if options['only'] and options['only'] not in name:
+                continue
+            client = APIClient()
+            if case.get('auth'):
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(ctx[case["auth"]])}')
+            url = reverse(name, kwargs=case.get('kwargs'))
+
+            for _ in range(options['warmup']):
+                self.request(client, method, url, case)
+            timings = [self.request(client, method, url, case)[1] for _ in range(options['iterations'])]
+            # Counting queries and tracing allocations both slow a request down,
+            # so each gets its own untimed request.
+            with CaptureQueriesContext(connection) as queries:
+                status = self.request(client, method, url, case)[0]
+            # Read the count now, as the next request resets the query log, and
+            # leave out the savepoints that roll each request back.
+            query_count = sum(1 for query in queries.captured_queries if not query['sql'].startswith(TRANSACTION_SQL))
+            tracemalloc.start()
+            try:
+                self.request(client, method, url, case)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            key = f'{method.upper()} {name}'
+            endpoints[key] = {
+                'url': url,
+                'status': status,
+                'p50_ms': round(statistics.median(timings) * 1000, 3),
+                'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+                'queries': query_count,
+                'peak_kib': round(peak / 1024, 1),
+            }
+            row = endpoints[key]
+            self.stdout.write(
+                f'{key:<40} {status:>6} {row["p50_ms"]:>9.2f} {row["p95_ms"]:>9.2f} {row["queries"]:>8} {row["peak_kib"]:>9.1f}'
+            )
+
+        return {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'store': ctx['store'].slug,
+            'store_products': ctx['store'].product_count,
+            'iterations': options['iterations'],
+            'endpoints': endpoints,
+        }
+
+    def request(self, client, method, url, case):
+        data = case.get('data')
+        if callable(data):
+            data = data()
+        if 'refresh_cookie' in case:
+            client.cookies['refresh_token'] = case['refresh_cookie']()
+        if case.get('throttled'):
+            # Every request from a new address, so none is refused by the rate limit.
+            client.defaults['REMOTE_ADDR'] = next(self.addresses)
+        with transaction.atomic():
+            start = time.perf_counter()
+            if 'content_type' in case:
+                response = getattr(client, method)(url, data, content_type=case['content_type'], headers=case.get('headers'))
+            else:
+                response = getattr(client, method)(
+                    url, data, format=case.get('format', 'json' if method != 'get' else None), headers=case.get('headers')
+                )
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+            # Leave the data as it was for the next request.
+            transaction.set_rollback(True)
+        return response.status_code, elapsed
+
+    def compare(self, results, options):
+        with open(options['baseline']) as f:
+            baseline = json.load(f)['endpoints']
+        regressions = 0
+        self.stdout.write(f'\nCompared with {options["baseline"]}:')
+        for key, row in results['endpoints'].items():
+            before = baseline.get(key)
+            if before is None:
+                self.stdout.write(f'{key:<40} new')
+                continue
+            change = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0
+            slower = change > options['threshold'] and row['p95_ms'] - before['p95_ms'] > NOISE_FLOOR_MS
+            more_queries = row['queries'] > before['queries']
+            line = f'{key:<40} p95 {before["p95_ms"]:.2f} -> {row["p95_ms"]:.2f} ms ({change:+.0f}%), queries {before["queries"]} -> {row["queries"]}'
+            if slower or more_queries:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f'{line}  REGRESSED'))
+            else:
+                self.stdout.write(line)
+        return regressions
@@ -0,0 +1,86 @@
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from mart.compression import brotli, compress
+from mart.renderers import FastJSONRenderer
+from stores.management.commands.benchmark_endpoints import Command as EndpointBenchmark, access_token, endpoint_cases
+
+
+def timed(func, iterations):
+    """``(result, median milliseconds)`` of calling ``func`` ``iterations`` times."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Time rendering and compressing the largest API responses: DRF\'s stdlib JSON renderer against '
+        'mart.renderers, then gzip and brotli as mart.compression applies them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs of each step')
+        parser.add_argument('--top', type=int, default=5, help='How many of the largest responses to measure')
+        parser.add_argument('--store', help='Slug of the store to benchmark as; defaults to the largest catalogue')
+        parser.add_argument('--password', default='password', help="Password of the store owner (seed_marketplace's default)")
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+        try:
+            # Only the response data is kept; the fixtures are rolled back.
+            with override_settings(MEDIA_ROOT=media_root, PRIVATE_MEDIA_ROOT=os.path.join(media_root, 'private')), transaction.atomic():
+                payloads = self.largest_payloads(options)
+                transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        iterations = options['iterations']
+        self.stdout.write(
+            f'{"endpoint":<28} {"bytes":>9} {"drf ms":>8} {"orjson ms":>10} {"gzip ms":>8} {"gzip bytes":>11} '
+            f'{"br ms":>7} {"br bytes":>9}'
+        )
+        for name, data in payloads:
+            stdlib, stdlib_ms = timed(lambda: JSONRenderer().render(data), iterations)
+            fast, fast_ms = timed(lambda: FastJSONRenderer().render(data), iterations)
+            (_, gzipped), gzip_ms = timed(lambda: compress(fast, {'gzip'}), iterations)
+            line = f'{name:<28} {len(fast):>9} {stdlib_ms:>8.2f} {fast_ms:>10.2f} {gzip_ms:>8.2f} {len(gzipped):>11}'
+            if brotli is not None:
+                (_, compressed), br_ms = timed(lambda: compress(fast, {'br'}), iterations)
+                line += f' {br_ms:>7.2f} {len(compressed):>9}'
+            else:
+                line += f' {"-":>7} {"-":>9}'
+            self.stdout.write(line)
+            if fast != stdlib:
+                self.stdout.write(self.style.ERROR(f'{name}: output differs from JSONRenderer'))
+        if brotli is None:
+            self.stdout.write('Brotli is not installed; responses are gzipped only')
+
+    def largest_payloads(self, options):
+        """``(url name, response data)`` of the ``--top`` largest successful GET responses."""
+        ctx = EndpointBenchmark().fixtures(options)
+        payloads = []
+        for name, method, case in endpoint_cases(ctx):
+            if method != 'get':
+                continue
+            client = APIClient()
+            if case.get('auth'):
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(ctx[case["auth"]])}')
+            data = case.get('data')
+            response = client.get(reverse(name, kwargs=case.get('kwargs')), data() if callable(data) else data)
+            if response.status_code == 200 and not response.streaming and getattr(response, 'data', None) is not None:
+                payloads.append((name, response.data))
+        payloads.sort(key=lambda payload: len(FastJSONRenderer().render(payload[1])), reverse=True)
+        return payloads[:options['top']]
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from stores.cache import bump_storefront_version
+from stores.images import pending_variants, refresh_variants
+from stores.models import Store, Product
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill the thumbnail, card and full-width WebP/JPEG variants of every product image and '
+        'store banner that lacks current ones, e.g. after changing IMAGE_VARIANT_WIDTHS or moving '
+        'media. New uploads are queued for process_image_variants when they are saved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Rows processed per query')
+
+    def handle(self, *args, **options):
+        built = (
+            self.process(Product, 'image', options['batch_size'])
+            + self.process(Store, 'banner_image', options['batch_size'])
+        )
+        self.stdout.write(f'Built variants for {built} image(s)')
+
+    def process(self, model, field_name, batch_size):
+        built = 0
+        failed = set()
+        while True:
+            batch = list(
+                model.objects.filter(pending_variants(field_name))
+                .exclude(pk__in=failed).order_by('pk')[:batch_size]
+            )
+            if not batch:
+                return built
+            for instance in batch:
+                try:
+                    refresh_variants(instance, field_name)
+                except (OSError, ValueError) as e:
+                    failed.add(instance.pk)
+                    self.stderr.write(f'{model.__name__} {instance.pk}: {e}')
+                    continue
+                bump_storefront_version(instance.pk if model is Store else instance.store_id)
+                built += 1
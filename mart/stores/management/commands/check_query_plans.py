@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from stores.models import Store
+from stores.query_plans import full_scans, hot_queries, query_plan
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN QUERY PLAN on the hot queries and fail if any of them falls back to a full table scan or sort'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', type=int, help='Store whose queries are planned (default: the first store)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_query_plans reads SQLite query plans')
+
+        stores = Store.objects.order_by('pk')
+        if options['store'] is not None:
+            stores = stores.filter(pk=options['store'])
+        store = stores.only('pk', 'owner_id').first()
+        if store is None:
+            raise CommandError('No store to plan the queries for')
+
+        failures = []
+        for name, queryset in hot_queries(store.owner_id, store.pk):
+            plan = query_plan(queryset)
+            problems = full_scans(plan)
+            if problems:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: {"; ".join(problems)}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if options['verbosity'] > 1 or problems:
+                for detail in plan:
+                    self.stdout.write(f'    {detail}')
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot queries regressed: {", ".join(failures)}')
@@ -0,0 +1,63 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from mart.storage import BLOB_DIR, blob_fields, file_digest
+
+
+class Command(BaseCommand):
+    help = (
+        'Move media uploaded before content-addressed storage into it, so every distinct file is kept '
+        'once and payment proofs leave MEDIA_ROOT. Rows are repointed one at a time and the old copies '
+        'removed as they are released.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Rows fetched per query')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many duplicates there are')
+
+    def handle(self, *args, **options):
+        total = moved = duplicates = saved = missing = 0
+        seen = set()
+        for model, field_name in blob_fields():
+            storage = model._meta.get_field(field_name).storage
+            legacy = (
+                model._default_manager.exclude(**{f'{field_name}__isnull': True})
+                .exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__startswith': f'{BLOB_DIR}/'})
+                .order_by('pk')
+            )
+            for instance in legacy.iterator(chunk_size=options['batch_size']):
+                # Everything uploaded before content-addressed storage is under MEDIA_ROOT.
+                old_name = getattr(instance, field_name).name
+                if not default_storage.exists(old_name):
+                    missing += 1
+                    self.stderr.write(f'{model.__name__} {instance.pk}: {old_name} is missing')
+                    continue
+                total += 1
+                with default_storage.open(old_name, 'rb') as old_file:
+                    name = storage.blob_name(file_digest(old_file), old_name)
+                    if (storage, name) in seen or storage.exists(name):
+                        duplicates += 1
+                        saved += old_file.size
+                    seen.add((storage, name))
+                    if options['dry_run']:
+                        continue
+                    name = storage.save(old_name, old_file)
+                # Saving through the model lets the usual signals refresh
+                # caches and the search index.
+                setattr(instance, field_name, name)
+                instance.save(update_fields=[field_name])
+                if not self.in_use(old_name):
+                    default_storage.delete(old_name)
+                moved += 1
+
+        if missing:
+            self.stderr.write(f'Skipped {missing} missing file(s)')
+        if options['dry_run']:
+            self.stdout.write(f'{total} file(s) to move; {duplicates} are duplicates, {saved} bytes to reclaim')
+            return
+        self.stdout.write(f'Moved {moved} file(s); {duplicates} were duplicates, {saved} bytes reclaimed')
+        if moved:
+            self.stdout.write('Run build_image_variants to rebuild the variants of moved images')
+
+    def in_use(self, name):
+        return any(model._default_manager.filter(**{field_name: name}).exists() for model, field_name in blob_fields())
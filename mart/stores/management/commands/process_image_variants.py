@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from stores.images import claim_variant_jobs, run_variant_jobs
+
+
+class Command(BaseCommand):
+    help = 'Build the image variants queued when product images and store banners are saved'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='Jobs claimed per batch')
+        parser.add_argument('--sleep', type=float, default=2, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = claim_variant_jobs(options['batch_size'])
+            if jobs:
+                built, failed = run_variant_jobs(jobs)
+                self.stdout.write(f'Built variants for {built} image(s), {failed} failed')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
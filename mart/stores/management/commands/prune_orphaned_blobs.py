@@ -0,0 +1,37 @@
+import os
+from django.core.management.base import BaseCommand
+from mart.storage import BLOB_DIR, blob_storage, private_storage
+from stores.images import delete_variants
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete content-addressed blobs that no row references any more. These are released while '
+        'another upload was reusing them, so delete() kept them for BLOB_DELETE_GRACE (see mart.storage).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report the orphaned blobs')
+
+    def handle(self, *args, **options):
+        orphaned = size = 0
+        for storage in (blob_storage(), private_storage()):
+            root = storage.path(BLOB_DIR)
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    if filename.startswith('.'):
+                        continue  # a blob being written
+                    name = f'{BLOB_DIR}/{os.path.relpath(os.path.join(directory, filename), root).replace(os.sep, "/")}'
+                    if storage.recently_saved(name) or storage.is_referenced(name):
+                        continue
+                    orphaned += 1
+                    size += storage.size(name)
+                    if options['verbosity'] > 1:
+                        self.stdout.write(name)
+                    if not options['dry_run']:
+                        storage.delete(name)
+                        if storage is blob_storage():
+                            delete_variants(name)
+
+        verb = 'Found' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {orphaned} orphaned blob(s), {size} bytes'))
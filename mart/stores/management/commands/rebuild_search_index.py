@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from stores.search import rebuild_index, search_available
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text product search index from the products table'
+
+    def handle(self, *args, **options):
+        if not search_available():
+            self.stdout.write(self.style.WARNING('Full-text search is only available on SQLite'))
+            return
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,186 @@
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from orders.analytics import rebuild_rollups
+from orders.models import Order, OrderItem
+from site_settings.models import SiteSettings
+from stores.models import Store, BankDetails, Product
+from stores.search import rebuild_index
+
+User = get_user_model()
+
+SEED_EMAIL_DOMAIN = 'seed.example.com'
+
+ADJECTIVES = ['Golden', 'Urban', 'Sunny', 'Royal', 'Green', 'Classic', 'Bright', 'Coastal', 'Prime', 'Happy']
+NOUNS = ['Market', 'Corner', 'Bazaar', 'Outlet', 'Depot', 'Shop', 'Hub', 'Emporium', 'Stores', 'Mart']
+PRODUCT_WORDS = [
+    'cotton', 'leather', 'wireless', 'organic', 'handmade', 'ceramic', 'steel', 'bamboo', 'vintage', 'premium',
+    'shirt', 'bag', 'headphones', 'coffee', 'mug', 'lamp', 'sneakers', 'watch', 'charger', 'blanket',
+    'rice', 'soap', 'perfume', 'notebook', 'backpack', 'jacket', 'bottle', 'speaker', 'chair', 'candle',
+]
+STATUS_WEIGHTS = {
+    'delivered': 45, 'shipped': 12, 'processing': 10, 'payment_confirmed': 10,
+    'pending': 12, 'payment_not_confirmed': 3, 'cancelled': 8,
+}
+ITEM_COUNT_WEIGHTS = {1: 50, 2: 25, 3: 12, 4: 8, 5: 5}
+BATCH_SIZE = 1000
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """Let bulk_create() keep the generated created_at/updated_at values."""
+    fields = [f for model in models for f in model._meta.fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic marketplace of vendors, stores, products and orders for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vendors', type=int, default=200, help='Vendors to create, each with one store')
+        parser.add_argument('--products', type=int, default=40, help='Median products per regular store')
+        parser.add_argument('--huge-stores', type=int, default=3, help='Stores with a very large catalogue')
+        parser.add_argument('--huge-products', type=int, default=20000, help='Products in each huge store')
+        parser.add_argument('--orders', type=int, default=20000, help='Orders to spread across the stores')
+        parser.add_argument('--days', type=int, default=180, help='Days of order history, ending today')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--password', default='password', help='Password of every seeded vendor')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded data first')
+
+    def handle(self, *args, **options):
+        seeded = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}')
+        if seeded.exists():
+            if not options['flush']:
+                raise CommandError('The database already holds seeded data; pass --flush to replace it')
+            # Stores, products and orders follow their owner (on_delete=CASCADE).
+            seeded.delete()
+
+        rng = random.Random(options['seed'])
+        end = timezone.localdate()
+        start = end - timedelta(days=options['days'] - 1)
+        self.origin = timezone.make_aware(datetime.combine(start, time.min))
+        self.span = timedelta(days=options['days']).total_seconds()
+
+        with transaction.atomic(), keep_timestamps(Store, Product, Order):
+            stores = self.create_stores(rng, options)
+            products = self.create_products(rng, stores, options)
+            order_count, item_count = self.create_orders(rng, stores, products, options)
+
+        if not SiteSettings.objects.exists():
+            SiteSettings.objects.create(
+                site_name='Multi-Vendor Mart', contact_email=f'hello@{SEED_EMAIL_DOMAIN}', contact_phone='0800000000',
+                address='1 Market Road', about_us='Seeded marketplace.', terms_and_conditions='Terms.', privacy_policy='Privacy.',
+            )
+        # bulk_create() skips the signals that keep these up to date.
+        rebuild_index()
+        rebuild_rollups(start, end)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(stores)} stores, {sum(len(p) for p in products.values())} products, '
+            f'{order_count} orders and {item_count} order items'
+        ))
+
+    def moment(self, rng):
+        """A random point in the seeded period."""
+        return self.origin + timedelta(seconds=self.span * rng.random())
+
+    def create_stores(self, rng, options):
+        password = make_password(options['password'])
+        users = User.objects.bulk_create([
+            User(
+                username=f'seed-vendor-{i}', email=f'vendor{i}@{SEED_EMAIL_DOMAIN}', password=password,
+                first_name='Vendor', last_name=str(i), is_vendor=True, is_email_verified=True, accepted_terms=True,
+            )
+            for i in range(options['vendors'])
+        ], batch_size=BATCH_SIZE)
+
+        stores = []
+        for i, user in enumerate(users):
+            created_at = self.moment(rng) - timedelta(days=30)
+            stores.append(Store(
+                owner=user, name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}', slug=f'seed-store-{i}',
+                location=f'{rng.randint(1, 200)} Market Road', contact_email=user.email,
+                contact_phone=f'080{rng.randint(10000000, 99999999)}', tag_line='Quality goods, fair prices',
+                is_active=rng.random() > 0.05, visit_count=rng.randint(0, 50000),
+                created_at=created_at, updated_at=created_at,
+            ))
+        stores = Store.objects.bulk_create(stores, batch_size=BATCH_SIZE)
+        BankDetails.objects.bulk_create([
+            BankDetails(store=store, bank_name='Seed Bank', account_number=f'{store.pk:010d}', account_name=store.name)
+            for store in stores
+        ], batch_size=BATCH_SIZE)
+        return stores
+
+    def create_products(self, rng, stores, options):
+        products = {}
+        for i, store in enumerate(stores):
+            if i < options['huge_stores']:
+                count = options['huge_products']
+            else:
+                # Catalogue sizes are long-tailed: most stores are small, a few are large.
+                count = max(1, round(rng.lognormvariate(0, 1) * options['products']))
+            batch = []
+            for n in range(count):
+                created_at = self.moment(rng)
+                batch.append(Product(
+                    store=store, sku=f'SKU-{n:06d}',
+                    name=' '.join(rng.sample(PRODUCT_WORDS, 3)).title(),
+                    description=' '.join(rng.choices(PRODUCT_WORDS, k=rng.randint(8, 40))),
+                    price=Decimal(f'{rng.lognormvariate(3, 0.8):.2f}'),
+                    quantity=0 if rng.random() < 0.08 else rng.randint(1, 500),
+                    created_at=created_at, updated_at=created_at,
+                ))
+            products[store.pk] = Product.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        return products
+
+    def create_orders(self, rng, stores, products, options):
+        # Bigger catalogues sell more; the huge stores get a large share of the orders.
+        weights = [len(products[store.pk]) ** 0.8 for store in stores]
+        statuses, status_weights = zip(*STATUS_WEIGHTS.items())
+        item_counts, item_weights = zip(*ITEM_COUNT_WEIGHTS.items())
+
+        order_count = item_count = 0
+        for offset in range(0, options['orders'], BATCH_SIZE):
+            orders = []
+            lines = []
+            for i in range(offset, min(offset + BATCH_SIZE, options['orders'])):
+                store = rng.choices(stores, weights)[0]
+                catalogue = products[store.pk]
+                items = {}
+                for _ in range(rng.choices(item_counts, item_weights)[0]):
+                    # A few best sellers account for most of a store's sales.
+                    product = catalogue[int(len(catalogue) * rng.random() ** 3)]
+                    items[product.pk] = (product, rng.choices((1, 2, 3, 5), (70, 18, 8, 4))[0])
+                created_at = self.moment(rng)
+                orders.append(Order(
+                    store=store, customer_name=f'Customer {i}', customer_email=f'customer{i}@{SEED_EMAIL_DOMAIN}',
+                    customer_phone=f'081{rng.randint(10000000, 99999999)}', customer_address=f'{rng.randint(1, 999)} Seed Street',
+                    total_amount=sum(product.price * quantity for product, quantity in items.values()),
+                    status=rng.choices(statuses, status_weights)[0],
+                    # Multiplying by an odd constant is a bijection modulo 16**10, so these never collide.
+                    tracking_number=f'{(i * 0x9E3779B1) % 16 ** 10:010X}',
+                    created_at=created_at, updated_at=created_at,
+                ))
+                lines.append(items.values())
+            orders = Order.objects.bulk_create(orders, batch_size=BATCH_SIZE)
+            items = [
+                OrderItem(order=order, product=product, quantity=quantity, price=product.price)
+                for order, order_lines in zip(orders, lines) for product, quantity in order_lines
+            ]
+            OrderItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+            order_count += len(orders)
+            item_count += len(items)
+        return order_count, item_count
@@ -0,0 +1,42 @@
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database over its read replicas (DATABASE_REPLICAS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep copying every INTERVAL seconds instead of copying once'
+        )
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('sync_sqlite_replica only applies to SQLite databases')
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('No replicas configured; set SQLITE_REPLICA_PATH')
+
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                start = time.perf_counter()
+                self.copy(settings.DATABASES['default']['NAME'], settings.DATABASES[alias]['NAME'])
+                self.stdout.write(f'{alias}: copied in {(time.perf_counter() - start) * 1000:.0f} ms')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, source_path, target_path):
+        # The backup API copies a consistent snapshot of the primary while it
+        # is being written, and replaces the replica in one write transaction,
+        # so readers see either the old copy or the new one, never a mix.
+        source = sqlite3.connect(source_path, timeout=20)
+        target = sqlite3.connect(target_path, timeout=20)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
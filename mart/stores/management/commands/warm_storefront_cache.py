@@ -0,0 +1,41 @@
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from stores.models import Store
+from stores.views import PublicStoreView
+
+
+class Command(BaseCommand):
+    help = 'Warm the storefront cache for the most visited active stores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, nargs='?', default=50, help='Number of stores to warm')
+        parser.add_argument(
+            '--base-url', default='http://localhost:8000',
+            help='Public URL of the API, used to build absolute media URLs'
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['base_url'])
+        factory = RequestFactory()
+        view = PublicStoreView.as_view()
+
+        def request(path):
+            # get() sets the scheme and port from `secure`, so pass it rather
+            # than environ defaults; the cache key is built from both and the host.
+            return factory.get(path, secure=url.scheme == 'https', HTTP_HOST=url.netloc)
+
+        slugs = (
+            Store.objects.filter(is_active=True)
+            .order_by('-visit_count', '-created_at')
+            .values_list('slug', flat=True)[:options['count']]
+        )
+        warmed = 0
+        for slug in slugs:
+            response = view(request(f'/stores/{slug}/'), slug=slug)
+            if response.status_code == 200:
+                warmed += 1
+            else:
+                self.stdout.write(self.style.WARNING(f'Skipped "{slug}": HTTP {response.status_code}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Warmed {warmed} storefront(s)'))
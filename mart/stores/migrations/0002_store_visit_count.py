@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='store',
+            name='visit_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
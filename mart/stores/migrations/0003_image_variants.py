@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0002_store_visit_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='store',
+            name='banner_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
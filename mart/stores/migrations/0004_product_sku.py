@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0003_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, help_text="Vendor's own product code, used by bulk imports", max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(condition=models.Q(('sku__isnull', False)), fields=('store', 'sku'), name='unique_product_sku_per_store'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS stores_product_fts USING fts5("
+        "name, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    # Rank name matches well above description matches.
+    schema_editor.execute("INSERT INTO stores_product_fts (stores_product_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    schema_editor.execute(
+        "INSERT INTO stores_product_fts (rowid, name, description) "
+        "SELECT id, name, description FROM stores_product"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS stores_product_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0004_product_sku'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0005_product_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['store', 'created_at', 'id'], name='product_store_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='store',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='store_active_recent_idx'),
+        ),
+    ]
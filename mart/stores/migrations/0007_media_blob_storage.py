@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:49
+
+import mart.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0006_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=mart.storage.blob_storage, upload_to='product_images/'),
+        ),
+        migrations.AlterField(
+            model_name='store',
+            name='banner_image',
+            field=models.ImageField(blank=True, null=True, storage=mart.storage.blob_storage, upload_to='store_banners/'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import RegexValidator
+from mart.storage import blob_storage
 
 class Store(models.Model):
     owner = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -10,9 +12,11 @@ class Store(models.Model):
     location = models.CharField(max_length=255)
     contact_email = models.EmailField()
     contact_phone = models.CharField(max_length=20)
-    banner_image = models.ImageField(upload_to='store_banners/', null=True, blank=True)
+    banner_image = models.ImageField(upload_to='store_banners/', storage=blob_storage, null=True, blank=True)
+    banner_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     tag_line = models.CharField(max_length=200, blank=True)
     is_active = models.BooleanField(default=False)
+    visit_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -32,6 +36,14 @@ class Store(models.Model):
         validators=[RegexValidator(regex=r'^#([A-Fa-f0-9]{6})$', message='Enter a valid 6-digit hex color code')]
     )
 
+    class Meta:
+        indexes = [
+            # Recent stores: only active stores are listed, newest first.
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='store_active_recent_idx'),
+            # Blob reference checks when an image is released (mart.storage).
+            models.Index(fields=['banner_image'], name='store_banner_image_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
@@ -59,13 +71,61 @@ class BankDetails(models.Model):
 
 class Product(models.Model):
     store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='products')
+    sku = models.CharField(max_length=64, null=True, blank=True, help_text="Vendor's own product code, used by bulk imports")
     name = models.CharField(max_length=100)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField()
-    image = models.ImageField(upload_to='product_images/', null=True, blank=True)
+    image = models.ImageField(upload_to='product_images/', storage=blob_storage, null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'sku'],
+                condition=models.Q(sku__isnull=False),
+                name='unique_product_sku_per_store',
+            ),
+        ]
+        indexes = [
+            # Storefront and vendor product pages: one store's products in (created_at, id) keyset order.
+            models.Index(fields=['store', 'created_at', 'id'], name='product_store_created_idx'),
+            # Blob reference checks when an image is released (mart.storage).
+            models.Index(fields=['image'], name='product_image_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+class ImageVariantJob(models.Model):
+    """
+    Queue row asking the process_image_variants worker to build the variants
+    of one product image or store banner. It is written by a post_save signal,
+    inside the transaction that saved the upload.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    model = models.CharField(max_length=50, help_text="app_label.model_name of the row")
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='variant_job_due_idx'),
+            models.Index(fields=['claim_token'], name='variant_job_claim_idx'),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"{self.model} {self.object_id} {self.field_name}"
@@ -0,0 +1,127 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique ``(created_at, id)`` ordering.
+
+    Every page is a range query that starts right after the last row of the
+    previous page, so deep pages cost the same as the first one. Views can
+    set ``ordering`` to ``('created_at', 'id')`` for oldest-first pages, and
+    ``paginate_count = True`` to get the total row count with the first page.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = getattr(settings, 'PAGINATION_PAGE_SIZE', 50)
+    max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 200)
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = getattr(view, 'ordering', None) or self.ordering
+        position = self.decode_cursor(request)
+        # Counting is the one query here that grows with the table, so it is
+        # only run for the first page rather than for every page after it.
+        self.count = queryset.count() if getattr(view, 'paginate_count', False) and position is None else None
+        return self.paginate(queryset, position, self.get_page_size(request))
+
+    def paginate(self, queryset, position=None, page_size=None):
+        queryset, page_size = self.page_queryset(queryset, position, page_size)
+        return self.page_results(list(queryset[:page_size + 1]), page_size)
+
+    async def apaginate(self, queryset, position=None, page_size=None):
+        """:meth:`paginate` on the async ORM."""
+        queryset, page_size = self.page_queryset(queryset, position, page_size)
+        return self.page_results([obj async for obj in queryset[:page_size + 1]], page_size)
+
+    def page_queryset(self, queryset, position, page_size):
+        page_size = page_size or self.page_size
+        date_field, id_field = (field.lstrip('-') for field in self.ordering)
+        queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            created_at, pk = position
+            op = 'lt' if self.ordering[0].startswith('-') else 'gt'
+            # The outer bound on created_at keeps this a single index range scan.
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__{op}': created_at}) | Q(**{f'{id_field}__{op}': pk}),
+                **{f'{date_field}__{op}e': created_at},
+            )
+        return queryset, page_size
+
+    def page_results(self, results, page_size):
+        date_field, id_field = (field.lstrip('-') for field in self.ordering)
+        page = results[:page_size]
+        if len(results) > page_size:
+            last = page[-1]
+            self.next_position = (getattr(last, date_field), getattr(last, id_field))
+        else:
+            self.next_position = None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, pk = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def get_next_cursor(self):
+        if self.next_position is None:
+            return None
+        created_at, pk = self.next_position
+        return urlsafe_b64encode(f'{created_at.isoformat()}|{pk}'.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'results': data}
+        if getattr(self, 'count', None) is not None:
+            response['count'] = self.count
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'count': {
+                    'type': 'integer',
+                },
+                'results': schema,
+            },
+        }
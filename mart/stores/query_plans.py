@@ -0,0 +1,57 @@
+"""
+EXPLAIN QUERY PLAN checks for the queries behind the busiest endpoints, used
+by `manage.py check_query_plans` and by stores.tests.
+"""
+from django.db import connection
+from django.utils import timezone
+from orders.models import Order
+from .models import Product, Store
+from .pagination import KeysetPagination
+from .views import PublicStoreProductsView
+
+
+def later_page(queryset, ordering=KeysetPagination.ordering):
+    paginator = KeysetPagination()
+    paginator.ordering = ordering
+    queryset, page_size = paginator.page_queryset(queryset, (timezone.now(), 1), None)
+    return queryset[:page_size + 1]
+
+
+def hot_queries(owner_id, store_id):
+    """
+    ``(name, queryset)`` for the queries behind the busiest endpoints, shaped
+    the way the views build them for the vendor ``owner_id`` and ``store_id``.
+    """
+    page = KeysetPagination.page_size + 1
+    orders = Order.objects.filter(store__owner_id=owner_id)
+    products = Product.objects.filter(store_id=store_id)
+    return [
+        ('order list', orders.order_by(*KeysetPagination.ordering)[:page]),
+        ('order list, later page', later_page(orders)),
+        ('order export', orders.order_by('created_at', 'id')),
+        ('order export by status', orders.filter(status='pending').order_by('created_at', 'id')),
+        ('orders by status', Order.objects.filter(status='pending').order_by('-pk')[:100]),
+        ('store products', products.order_by(*PublicStoreProductsView.ordering)[:page]),
+        ('store products, later page', later_page(products, PublicStoreProductsView.ordering)),
+        ('vendor products', products.order_by(*KeysetPagination.ordering)[:page]),
+        ('recent stores', Store.objects.filter(is_active=True).order_by('-created_at')[:6]),
+    ]
+
+
+def query_plan(queryset):
+    """The detail column of SQLite's EXPLAIN QUERY PLAN for ``queryset``."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[3] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """Plan steps that read a whole table or sort rows the index should already have ordered."""
+    problems = []
+    for detail in plan:
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            problems.append(detail)
+        elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            problems.append(detail)
+    return problems
@@ -0,0 +1,76 @@
+import re
+from django.db import connection
+from .models import Product
+
+SEARCH_TABLE = 'stores_product_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_available():
+    """The FTS5 index only exists on SQLite; other backends fall back to icontains."""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so operators
+    typed by shoppers are not parsed) and the last one matches as a prefix.
+    """
+    terms = [f'"{token}"' for token in _TOKEN_RE.findall(text)]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def index_products(products):
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, name, description) VALUES (%s, %s, %s)',
+            [(product.pk, product.name, product.description) for product in products]
+        )
+
+
+def unindex_product(product_id):
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [product_id])
+
+
+def rebuild_index():
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM {Product._meta.db_table}'
+        )
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+
+
+def search_product_ids(text, limit, offset=0):
+    """Ids of products in active stores matching ``text``, best match first."""
+    if not search_available():
+        return list(
+            Product.objects.filter(store__is_active=True, name__icontains=text)
+            .order_by('-created_at').values_list('id', flat=True)[offset:offset + limit]
+        )
+
+    match = build_match_query(text)
+    if match is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT p.id FROM {SEARCH_TABLE} f '
+            f'JOIN stores_product p ON p.id = f.rowid '
+            f'JOIN stores_store s ON s.id = p.store_id '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND s.is_active '
+            f'ORDER BY f.rank LIMIT %s OFFSET %s',
+            [match, limit, offset]
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import Store, BankDetails, Product
+from .images import variant_urls
+from .utils import get_vendor_store_id
 
 class BankDetailsSerializer(serializers.ModelSerializer):
     class Meta:
@@ -7,17 +9,46 @@ class BankDetailsSerializer(serializers.ModelSerializer):
         fields = ['id', 'bank_name', 'account_number', 'account_name']
 
 class ProductSerializer(serializers.ModelSerializer):
+    image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Product
-        fields = ['id', 'name', 'description', 'price', 'quantity', 'image']
+        fields = ['id', 'sku', 'name', 'description', 'price', 'quantity', 'image', 'image_variants']
+
+    def validate_sku(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        if request is not None:
+            duplicates = Product.objects.filter(store_id=get_vendor_store_id(request), sku=value)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError("You already have a product with this SKU.")
+        return value
+
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image, obj.image_variants, self.context.get('request'))
+
+class ProductSearchResultSerializer(ProductSerializer):
+    store_name = serializers.CharField(source='store.name', read_only=True)
+    store_slug = serializers.CharField(source='store.slug', read_only=True)
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ['store_name', 'store_slug']
 
 class StoreSerializer(serializers.ModelSerializer):
     bank_details = BankDetailsSerializer(many=True, read_only=True)
+    banner_image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Store
-        fields = ['id', 'name', 'slug', 'location', 'contact_email', 'contact_phone', 'is_active', 'banner_image', 'tag_line', 'primary_color', 'secondary_color', 'accent_color', 'bank_details']
+        fields = ['id', 'name', 'slug', 'location', 'contact_email', 'contact_phone', 'is_active', 'banner_image', 'banner_image_variants', 'tag_line', 'primary_color', 'secondary_color', 'accent_color', 'bank_details']
         read_only_fields = ['slug', 'is_active']
 
+    def get_banner_image_variants(self, obj):
+        return variant_urls(obj.banner_image, obj.banner_image_variants, self.context.get('request'))
+
     def update(self, instance, validated_data):
         instance = super().update(instance, validated_data)
         if 'name' in validated_data:
@@ -25,6 +56,11 @@ class StoreSerializer(serializers.ModelSerializer):
         return instance
     
 class RecentStoreSerializer(serializers.ModelSerializer):
+    banner_image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Store
-        fields = ['id', 'name', 'slug', 'tag_line', 'banner_image', 'primary_color', 'secondary_color', 'accent_color']
\ No newline at end of file
+        fields = ['id', 'name', 'slug', 'tag_line', 'banner_image', 'banner_image_variants', 'primary_color', 'secondary_color', 'accent_color']
+
+    def get_banner_image_variants(self, obj):
+        return variant_urls(obj.banner_image, obj.banner_image_variants, self.context.get('request'))
\ No newline at end of file
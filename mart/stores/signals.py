@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django_cleanup.signals import cleanup_post_delete
+from .models import Store, BankDetails, Product
+from .cache import bump_storefront_version
+from .images import delete_variants, needs_variants, queue_variants
+from .search import index_products, unindex_product
+
+
+@receiver([post_save, post_delete], sender=Store)
+def invalidate_store(sender, instance, **kwargs):
+    # After the commit: a storefront loaded before then, under the old
+    # version, must not be cached under the new one.
+    store_id = instance.pk
+    transaction.on_commit(lambda: bump_storefront_version(store_id))
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=BankDetails)
+def invalidate_store_children(sender, instance, **kwargs):
+    store_id = instance.store_id
+    transaction.on_commit(lambda: bump_storefront_version(store_id))
+
+
+@receiver(cleanup_post_delete)
+def delete_image_variants(sender, field_name, file_name, file, **kwargs):
+    # django_cleanup removes replaced and orphaned uploads; drop their variants
+    # with them, unless another row still shares the image.
+    if (sender, field_name) in ((Product, 'image'), (Store, 'banner_image')) and not file.storage.exists(file_name):
+        delete_variants(file_name)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Store)
+def queue_image_variants(sender, instance, **kwargs):
+    # New, replaced and cleared images; the worker builds the variants off
+    # the request, and the job commits or rolls back with the upload.
+    field_name = 'image' if sender is Product else 'banner_image'
+    if needs_variants(instance, field_name):
+        queue_variants(instance, field_name)
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_deleted_product(sender, instance, **kwargs):
+    unindex_product(instance.pk)
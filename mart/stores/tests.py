@@ -1,3 +1,25 @@
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from .models import Store
+from .query_plans import full_scans, hot_queries, query_plan
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == 'sqlite', 'Reads SQLite query plans')
+class QueryPlanTests(TestCase):
+    """The hot queries stay on their indexes, as `manage.py check_query_plans` reports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = get_user_model().objects.create_user(username='vendor', email='vendor@example.com', password='password')
+        cls.store = Store.objects.create(
+            owner=owner, name='Vendor store', location='Lagos', contact_email='vendor@example.com',
+            contact_phone='08000000000', is_active=True,
+        )
+
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in hot_queries(self.store.owner_id, self.store.pk):
+            with self.subTest(query=name):
+                plan = query_plan(queryset)
+                self.assertEqual(full_scans(plan), [], '\n'.join(plan))
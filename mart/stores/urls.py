@@ -6,9 +6,13 @@ from .views import (
     BankDetailsListView,
     BankDetailsDetailView,
     ProductListCreateView,
+    ProductImportView,
     ProductDetailView,
     PublicStoreView,
+    PublicStoreProductsView,
     RecentStoresView,
+    ProductSearchView,
+    SalesAnalyticsView,
 )
 
 urlpatterns = [
@@ -18,7 +22,11 @@ urlpatterns = [
     path('bank-details/list/', BankDetailsListView.as_view(), name='bank-details-list'),
     path('bank-details/<int:pk>/', BankDetailsDetailView.as_view(), name='bank-details-detail'),
     path('products/', ProductListCreateView.as_view(), name='product-list-create'),
+    path('products/import/', ProductImportView.as_view(), name='product-import'),
     path('products/<int:pk>/', ProductDetailView.as_view(), name='product-detail'),
     path('recent/', RecentStoresView.as_view(), name='recent-stores'),
+    path('search/', ProductSearchView.as_view(), name='product-search'),
+    path('analytics/', SalesAnalyticsView.as_view(), name='sales-analytics'),
     path('<slug:slug>/', PublicStoreView.as_view(), name='public-store-view'),
+    path('<slug:slug>/products/', PublicStoreProductsView.as_view(), name='public-store-products'),
 ]
\ No newline at end of file
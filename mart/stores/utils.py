@@ -0,0 +1,30 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from .models import Store
+
+
+def get_vendor_store_id(request):
+    """
+    Id of the requesting vendor's store. Read from the token's ``store_id``
+    claim when there is one, otherwise looked up once per request.
+    """
+    if not hasattr(request, '_vendor_store_id'):
+        store_id = getattr(request.user, 'store_id', None)
+        if store_id is None:
+            store_id = Store.objects.filter(owner_id=request.user.pk).values_list('pk', flat=True).first()
+        if store_id is None:
+            raise Http404("No Store matches the given query.")
+        request._vendor_store_id = store_id
+    return request._vendor_store_id
+
+
+def get_vendor_store(request):
+    """The requesting vendor's store, fetched at most once per request."""
+    if not hasattr(request, '_vendor_store'):
+        if hasattr(request, '_vendor_store_id') or getattr(request.user, 'store_id', None) is not None:
+            store = get_object_or_404(Store, pk=get_vendor_store_id(request))
+        else:
+            store = get_object_or_404(Store, owner_id=request.user.pk)
+            request._vendor_store_id = store.pk
+        request._vendor_store = store
+    return request._vendor_store
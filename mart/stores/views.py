@@ -1,8 +1,26 @@
+import csv
 from rest_framework import generics, permissions, status
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Store, BankDetails, Product
-from .serializers import StoreSerializer, BankDetailsSerializer, ProductSerializer, RecentStoreSerializer
+from .serializers import StoreSerializer, BankDetailsSerializer, ProductSerializer, RecentStoreSerializer, ProductSearchResultSerializer
+from .cache import get_cached_storefront, get_storefront_version, set_cached_storefront, record_storefront_visit
+from .importer import IMPORT_READERS, import_products
+from .pagination import KeysetPagination
+from .search import search_product_ids
+from .utils import get_vendor_store, get_vendor_store_id
+from accounts.auth import VendorClaimsAuthentication
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models import Count, Sum
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from orders.analytics import day_bounds
+from orders.models import Order, StoreDailySales, ProductDailySales
+from django.urls import reverse
+from rest_framework.utils.urls import replace_query_param
 
 class IsVerifiedVendor(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -10,61 +28,89 @@ class IsVerifiedVendor(permissions.BasePermission):
 
 class StoreCreateView(generics.CreateAPIView):
     serializer_class = StoreSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user, is_active=True)
+        serializer.save(owner_id=self.request.user.id, is_active=True)
 
 class StoreDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = StoreSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def get_object(self):
-        return get_object_or_404(Store, owner=self.request.user)
+        return get_vendor_store(self.request)
 
 class BankDetailsCreateView(generics.CreateAPIView):
     serializer_class = BankDetailsSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def perform_create(self, serializer):
-        store = get_object_or_404(Store, owner=self.request.user)
-        serializer.save(store=store)
+        serializer.save(store_id=get_vendor_store_id(self.request))
 
 class BankDetailsDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BankDetailsSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def get_queryset(self):
-        store = get_object_or_404(Store, owner=self.request.user)
-        return BankDetails.objects.filter(store=store)
+        return BankDetails.objects.filter(store_id=get_vendor_store_id(self.request))
 
 class BankDetailsListView(generics.ListAPIView):
     serializer_class = BankDetailsSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def get_queryset(self):
-        store = get_object_or_404(Store, owner=self.request.user)
-        return BankDetails.objects.filter(store=store)
+        return BankDetails.objects.filter(store_id=get_vendor_store_id(self.request))
 
 class ProductListCreateView(generics.ListCreateAPIView):
     serializer_class = ProductSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
+    pagination_class = KeysetPagination
+    paginate_count = True
 
     def get_queryset(self):
-        store = get_object_or_404(Store, owner=self.request.user)
-        return Product.objects.filter(store=store)
+        return Product.objects.filter(store_id=get_vendor_store_id(self.request))
 
     def perform_create(self, serializer):
-        store = get_object_or_404(Store, owner=self.request.user)
-        serializer.save(store=store)
+        serializer.save(store_id=get_vendor_store_id(self.request))
+
+class ProductImportView(APIView):
+    """
+    Create or update products by SKU from an uploaded ``file``: CSV with a header
+    row, or JSON lines. Columns are sku, name, description, price and quantity.
+    """
+    authentication_classes = [VendorClaimsAuthentication]
+    permission_classes = [IsVerifiedVendor]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request):
+        store = get_vendor_store(request)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST)
+
+        import_type = request.data.get('type') or upload.name.rsplit('.', 1)[-1].lower()
+        if import_type not in IMPORT_READERS:
+            return Response({"error": "Upload a .csv or .jsonl file"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_products(store, IMPORT_READERS[import_type](upload))
+        except (UnicodeDecodeError, csv.Error) as e:
+            return Response({"error": f"Could not read file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
 
 class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProductSerializer
+    authentication_classes = [VendorClaimsAuthentication]
     permission_classes = [IsVerifiedVendor]
 
     def get_queryset(self):
-        store = get_object_or_404(Store, owner=self.request.user)
-        return Product.objects.filter(store=store)
+        return Product.objects.filter(store_id=get_vendor_store_id(self.request))
 
 class PublicStoreView(generics.RetrieveAPIView):
     serializer_class = StoreSerializer
@@ -73,14 +119,48 @@ class PublicStoreView(generics.RetrieveAPIView):
     queryset = Store.objects.filter(is_active=True)
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        products = Product.objects.filter(store=instance)
-        product_serializer = ProductSerializer(products, many=True)
-        data = serializer.data
-        data['products'] = product_serializer.data
+        slug = kwargs[self.lookup_field]
+        base_url = request.build_absolute_uri('/')
+        store_id, version, data = get_cached_storefront(slug, base_url)
+        if data is None:
+            if store_id is None:
+                store_id = get_object_or_404(self.get_queryset().values_list('pk', flat=True), slug=slug)
+                version = get_storefront_version(store_id)
+            # Loaded only now that the version is known; see set_cached_storefront().
+            instance = self.get_object()
+            paginator = KeysetPagination()
+            paginator.ordering = PublicStoreProductsView.ordering
+            products = paginator.paginate(Product.objects.filter(store=instance))
+            data = storefront_data(request, instance, products, paginator)
+            if instance.pk == store_id:
+                set_cached_storefront(instance, version, base_url, data)
+            store_id = instance.pk
+        record_storefront_visit(store_id)
         return Response(data)
 
+def storefront_data(request, store, products, paginator):
+    """The storefront payload: the store, its first page of products and a link to the next page."""
+    data = StoreSerializer(store, context={'request': request}).data
+    data['products'] = ProductSerializer(products, many=True).data
+    data['products_next'] = None
+    if paginator.get_next_cursor():
+        data['products_next'] = replace_query_param(
+            request.build_absolute_uri(reverse('public-store-products', kwargs={'slug': store.slug})),
+            paginator.cursor_query_param,
+            paginator.get_next_cursor()
+        )
+    return data
+
+class PublicStoreProductsView(generics.ListAPIView):
+    serializer_class = ProductSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    ordering = ('created_at', 'id')
+
+    def get_queryset(self):
+        store = get_object_or_404(Store, slug=self.kwargs['slug'], is_active=True)
+        return Product.objects.filter(store=store)
+
 class RecentStoresView(generics.ListAPIView):
     serializer_class = RecentStoreSerializer
     permission_classes = [permissions.AllowAny]
@@ -97,4 +177,96 @@ class RecentStoresView(generics.ListAPIView):
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+class ProductSearchView(APIView):
+    """Ranked product search across every active store: ``?q=<text>&page=<n>``."""
+    permission_classes = [permissions.AllowAny]
+    page_size = 20
+    max_page = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            page = min(max(int(request.query_params.get('page', 1)), 1), self.max_page)
+        except ValueError:
+            page = 1
+        if not query:
+            return Response({"results": [], "next": None})
+
+        ids = search_product_ids(query, self.page_size + 1, (page - 1) * self.page_size)
+        products = Product.objects.select_related('store').in_bulk(ids[:self.page_size])
+        serializer = ProductSearchResultSerializer(
+            [products[pk] for pk in ids[:self.page_size] if pk in products], many=True, context={'request': request}
+        )
+        next_link = None
+        if len(ids) > self.page_size and page < self.max_page:
+            next_link = replace_query_param(request.build_absolute_uri(), 'page', page + 1)
+        return Response({"results": serializer.data, "next": next_link})
+
+
+class SalesAnalyticsView(APIView):
+    """
+    Revenue, order count, average order value and units sold for the vendor's
+    store between ``from`` and ``to`` (inclusive, YYYY-MM-DD; default: the last
+    30 days), summed from the daily rollups in orders.analytics. ``statuses``
+    counts the orders placed in the range by status, cancelled ones included.
+    """
+    authentication_classes = [VendorClaimsAuthentication]
+    permission_classes = [IsVerifiedVendor]
+
+    def get(self, request):
+        store_id = get_vendor_store_id(request)
+        end = timezone.localdate()
+        start = end - timedelta(days=29)
+        try:
+            if request.query_params.get('to'):
+                end = parse_date(request.query_params['to'])
+            if request.query_params.get('from'):
+                start = parse_date(request.query_params['from'])
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            return Response({"error": "Invalid date range"}, status=status.HTTP_400_BAD_REQUEST)
+
+        daily = list(
+            StoreDailySales.objects.filter(store_id=store_id, date__range=(start, end))
+            .order_by('date').values('date', 'order_count', 'units_sold', 'revenue')
+        )
+        cents = Decimal('0.01')
+        revenue = sum((row['revenue'] for row in daily), Decimal('0')).quantize(cents)
+        order_count = sum(row['order_count'] for row in daily)
+        products = (
+            ProductDailySales.objects.filter(store_id=store_id, date__range=(start, end))
+            .values('product_id', 'product__name')
+            .annotate(order_count=Sum('order_count'), units_sold=Sum('units_sold'), revenue=Sum('revenue'))
+            .order_by('-revenue')
+        )
+        lower, upper = day_bounds(start, end)
+        statuses = (
+            Order.objects.filter(store_id=store_id, created_at__gte=lower, created_at__lt=upper)
+            .values('status').annotate(count=Count('id')).order_by('status')
+        )
+
+        return Response({
+            'from': start,
+            'to': end,
+            'totals': {
+                'revenue': revenue,
+                'order_count': order_count,
+                'average_order_value': (revenue / order_count).quantize(cents) if order_count else Decimal('0.00'),
+                'units_sold': sum(row['units_sold'] for row in daily),
+            },
+            'daily': daily,
+            'products': [
+                {
+                    'product_id': row['product_id'],
+                    'product_name': row['product__name'],
+                    'order_count': row['order_count'],
+                    'units_sold': row['units_sold'],
+                    'revenue': row['revenue'].quantize(cents),
+                }
+                for row in products
+            ],
+            'statuses': list(statuses),
+        })